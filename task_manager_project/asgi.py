@@ -2,6 +2,8 @@
 ASGI config for task_manager_project project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve it with an ASGI server (e.g. ``uvicorn task_manager_project.asgi:application``)
+for the live notification stream, which answers 204 under WSGI.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -1,11 +1,15 @@
 # CLoud project/task_manager_project/context_processors.py
-from tasks.models import Notification
+from django.utils.functional import SimpleLazyObject
+
+from tasks.notifications import get_unread_count
 
 def unread_notifications(request):
     """
     Adds the count of unread notifications for the logged-in user to the context.
+    The value is lazy, so pages that never render the badge don't touch the cache or database.
     """
-    if request.user.is_authenticated:
-        unread_count = Notification.objects.filter(user=request.user, is_read=False).count()
-        return {'unread_notifications_count': unread_count}
-    return {'unread_notifications_count': 0} # Return 0 if user is not authenticated
+    def count():
+        if request.user.is_authenticated:
+            return get_unread_count(request.user.pk)
+        return 0 # Return 0 if user is not authenticated
+    return {'unread_notifications_count': SimpleLazyObject(count)}
@@ -0,0 +1,76 @@
+# task_manager_project/log.py
+import copy
+import json
+import logging
+import queue
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+# Attributes every LogRecord has; anything else on a record came in through `extra`
+RESERVED_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line: timestamp, level, logger and message, plus
+    every field passed through `extra`.
+    """
+
+    def format(self, record):
+        payload = {
+            'timestamp': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        payload.update((key, value) for key, value in vars(record).items() if key not in RESERVED_ATTRS)
+        if record.exc_info:
+            payload['exception'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload['exception'] = record.exc_text
+        return json.dumps(payload, default=str)
+
+
+class QueueListenerHandler(QueueHandler):
+    """
+    Hands records to a bounded in-memory queue; a background QueueListener
+    thread formats them and writes them to `stream` (stderr by default), so
+    logging never blocks the request thread on I/O. When the queue is full
+    records are dropped and counted rather than waited on.
+
+    Usable straight from LOGGING (Python 3.11's dictConfig has no queue
+    handler support): the handler's `formatter` is applied by the listener.
+    """
+
+    def __init__(self, stream=None, queue_size=10000):
+        super().__init__(queue.Queue(queue_size))
+        self.target = logging.StreamHandler(stream)
+        self.dropped = 0
+        self.listener = QueueListener(self.queue, self.target)
+        self.listener.start()
+
+    def setFormatter(self, fmt):
+        # Format on the listener thread, not in prepare() on the caller's
+        self.target.setFormatter(fmt)
+
+    def prepare(self, record):
+        # Merge the arguments now (they may change later) but leave `extra` fields for the formatter
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        # Called by logging.shutdown() at exit and when LOGGING is reconfigured; drains the queue
+        if self.listener._thread is not None:
+            self.listener.stop()
+        super().close()
@@ -0,0 +1,150 @@
+# task_manager_project/middleware.py
+import heapq
+import logging
+import random
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger('task_manager.requests')
+
+# "IN (%s, %s, %s)" and "VALUES (%s, %s), (%s, %s)" differ only by how many rows they carry
+PLACEHOLDER_LISTS = re.compile(r'\(%s(?:,\s*%s)*\)(?:,\s*\(%s(?:,\s*%s)*\))*')
+
+
+def fingerprint(sql):
+    """
+    Normalizes a statement so the same query with different parameters (and
+    placeholder list lengths) compares equal: repeats are N+1 candidates.
+    """
+    return PLACEHOLDER_LISTS.sub('(...)', ' '.join(sql.split()))
+
+
+class QueryRecorder:
+    """
+    connection.execute_wrapper() callback collecting count, total time, the
+    slowest statements and fingerprint counts for one request.
+    """
+
+    def __init__(self, slowest=3):
+        self.count = 0
+        self.duration = 0.0
+        self.slowest = []
+        self.keep = slowest
+        self.fingerprints = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            self.count += 1
+            self.duration += duration
+            self.fingerprints[fingerprint(sql)] += 1
+            # Min-heap of the `keep` slowest; the counter breaks ties without comparing SQL
+            entry = (duration, self.count, sql)
+            if len(self.slowest) < self.keep:
+                heapq.heappush(self.slowest, entry)
+            else:
+                heapq.heappushpop(self.slowest, entry)
+
+    def duplicates(self):
+        return [(count, sql) for sql, count in self.fingerprints.most_common() if count > 1]
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Opt-in, sampled per-request SQL instrumentation. For a sampled request it
+    records every query on every database, adds a Server-Timing header (db
+    and total time) and logs one structured line with the query count, SQL
+    time, slowest statements and repeated query fingerprints.
+
+    Enabled by REQUEST_INSTRUMENTATION_SAMPLE_RATE (0 to 1); at 0 Django drops
+    the middleware entirely. Queries run while a streaming response is being
+    consumed happen after this middleware returns and aren't counted.
+
+    Under ASGI the middleware runs async, so async views (the notification
+    stream) keep running on the event loop instead of being pinned to a
+    thread.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        self.sample_rate = settings.REQUEST_INSTRUMENTATION_SAMPLE_RATE
+        if self.sample_rate <= 0:
+            raise MiddlewareNotUsed
+        self.slowest = settings.REQUEST_INSTRUMENTATION_SLOWEST_QUERIES
+
+    def sampled(self):
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    def recording(self, recorder):
+        stack = ExitStack()
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(recorder))
+        return stack
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.sampled():
+            return self.get_response(request)
+
+        recorder = QueryRecorder(self.slowest)
+        started = time.perf_counter()
+        with self.recording(recorder):
+            response = self.get_response(request)
+        return self.report(request, response, recorder, time.perf_counter() - started)
+
+    async def __acall__(self, request):
+        if not self.sampled():
+            return await self.get_response(request)
+
+        recorder = QueryRecorder(self.slowest)
+        started = time.perf_counter()
+        # Connections belong to threads: wrap those of the thread the request's sync code (ORM calls) runs in
+        stack = await sync_to_async(self.recording)(recorder)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        return self.report(request, response, recorder, time.perf_counter() - started)
+
+    def report(self, request, response, recorder, total):
+        response['Server-Timing'] = (
+            f'db;dur={recorder.duration * 1000:.2f};desc="{recorder.count} queries", '
+            f'app;dur={total * 1000:.2f}'
+        )
+        duplicates = recorder.duplicates()
+        match = getattr(request, 'resolver_match', None)
+        logger.info(
+            "%s %s %s: %d queries, %.1fms SQL, %.1fms total, %d repeated",
+            request.method, request.path, response.status_code,
+            recorder.count, recorder.duration * 1000, total * 1000, len(duplicates),
+            extra={
+                'method': request.method,
+                'path': request.path,
+                'view': match.view_name if match else None,
+                'status': response.status_code,
+                'duration_ms': round(total * 1000, 2),
+                'db_queries': recorder.count,
+                'db_duration_ms': round(recorder.duration * 1000, 2),
+                'slowest_queries': [
+                    {'duration_ms': round(duration * 1000, 2), 'sql': sql}
+                    for duration, _, sql in sorted(recorder.slowest, reverse=True)
+                ],
+                'repeated_queries': [{'count': count, 'sql': sql} for count, sql in duplicates],
+            },
+        )
+        return response
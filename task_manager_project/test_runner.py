@@ -0,0 +1,26 @@
+# task_manager_project/test_runner.py
+import logging
+
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+
+
+class QuietLoggingTestRunner(DiscoverRunner):
+    """
+    Keeps the application's log lines off the console during `manage.py
+    test`: the loggers configured in LOGGING get a NullHandler for the run.
+    Tests that check log output use assertLogs(), which installs its own.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.saved_handlers = {}
+        for name in settings.LOGGING.get('loggers', {}):
+            logger = logging.getLogger(name)
+            self.saved_handlers[name] = logger.handlers
+            logger.handlers = [logging.NullHandler()]
+
+    def teardown_test_environment(self, **kwargs):
+        for name, handlers in self.saved_handlers.items():
+            logging.getLogger(name).handlers = handlers
+        super().teardown_test_environment(**kwargs)
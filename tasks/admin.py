@@ -1,8 +1,110 @@
 # tasks/admin.py
 from django.contrib import admin
-from .models import Task, Category, Notification
+from django.contrib.admin.views.main import PAGE_VAR
+from django.utils.translation import ngettext
 
-# Register your models here.
-admin.site.register(Category) 
-admin.site.register(Task)  
-admin.site.register(Notification)   
+from .bulk import apply_bulk_action, delete_categories, delete_tasks
+from .models import Task, Category, Notification, User
+from .notifications import delete_notifications, mark_notifications_read
+from .pagination import EstimatedCountPaginator
+
+
+class OwnerDeleteMixin:
+    """
+    Sends admin deletes through the model's set-based delete helper
+    (`delete_rows`), one owner at a time, so the change log and cached
+    counters stay right.
+    """
+    delete_rows = None
+
+    def delete_model(self, request, obj):
+        self.delete_queryset(request, self.model.objects.filter(pk=obj.pk))
+
+    def delete_queryset(self, request, queryset):
+        for user_id in queryset.order_by().values_list('user_id', flat=True).distinct():
+            self.delete_rows(user_id, queryset.filter(user_id=user_id))
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """
+    Changelist settings for tables too big to count or sort casually: no
+    second COUNT(*) for the "N total" link, an estimated count past
+    TASKS_ADMIN_EXACT_COUNT_LIMIT, and newest-first by primary key so the
+    default page is read straight off the pk index.
+    """
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+    ordering = ('-pk',)
+
+    def get_paginator(self, request, queryset, per_page, orphans=0, allow_empty_first_page=True):
+        # The exact count window starts from the requested page, so filtered lists can page on
+        try:
+            page_number = max(int(request.GET.get(PAGE_VAR, 1)), 1)
+        except ValueError:
+            page_number = 1
+        return self.paginator(queryset, per_page, orphans, allow_empty_first_page, page_number=page_number)
+
+
+class CategoryAdmin(OwnerDeleteMixin, admin.ModelAdmin):
+    list_display = ('name', 'user')
+    search_fields = ('name',)
+    delete_rows = staticmethod(delete_categories)
+    # The user model isn't registered with this admin site, so no autocomplete for owners
+    raw_id_fields = ('user',)
+
+    def get_queryset(self, request):
+        # Changelist and autocomplete results both show Category.__str__, which includes the owner
+        return super().get_queryset(request).with_related()
+
+
+class TaskAdmin(OwnerDeleteMixin, LargeTableAdmin):
+    list_display = ('title', 'user', 'category__name', 'due_date', 'completed', 'priority')
+    list_select_related = ('user', 'category')
+    # Each filter has a matching index (see Task.Meta); priority is left out as it has none
+    list_filter = ('completed', 'due_date')
+    search_fields = ('title',)
+    raw_id_fields = ('user',)
+    autocomplete_fields = ('category',)
+    actions = ('mark_completed', 'mark_reopened')
+    delete_rows = staticmethod(delete_tasks)
+
+    def apply_to_owners(self, queryset, action):
+        # Owner by owner through the same path as the task list's bulk form, so reminders,
+        # notifications, the change log and dashboard snapshots stay in step
+        owners = User.objects.filter(pk__in=queryset.order_by().values('user_id'))
+        return sum(apply_bulk_action(owner, queryset, action) for owner in owners)
+
+    @admin.action(description='Mark selected tasks as completed')
+    def mark_completed(self, request, queryset):
+        count = self.apply_to_owners(queryset, 'complete')
+        self.message_user(request, ngettext('%d task marked as completed.', '%d tasks marked as completed.', count) % count)
+
+    @admin.action(description='Reopen selected tasks')
+    def mark_reopened(self, request, queryset):
+        count = self.apply_to_owners(queryset, 'reopen')
+        self.message_user(request, ngettext('%d task reopened.', '%d tasks reopened.', count) % count)
+
+
+class NotificationAdmin(OwnerDeleteMixin, LargeTableAdmin):
+    list_display = ('message', 'user', 'notification_type', 'is_read', 'created_at')
+    # Notification.__str__ (delete confirmations, history) shows the user too
+    list_select_related = ('user',)
+    # Each filter has a matching index (see Notification.Meta)
+    list_filter = ('is_read', 'notification_type')
+    raw_id_fields = ('user', 'task')
+    actions = ('mark_read',)
+    delete_rows = staticmethod(delete_notifications)
+
+    @admin.action(description='Mark selected notifications as read')
+    def mark_read(self, request, queryset):
+        count = 0
+        for user_id in queryset.order_by().values_list('user_id', flat=True).distinct():
+            count += mark_notifications_read(user_id, queryset.filter(user_id=user_id))
+        self.message_user(
+            request, ngettext('%d notification marked as read.', '%d notifications marked as read.', count) % count
+        )
+
+
+admin.site.register(Category, CategoryAdmin)
+admin.site.register(Task, TaskAdmin)
+admin.site.register(Notification, NotificationAdmin)
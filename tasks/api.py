@@ -0,0 +1,369 @@
+# tasks/api.py
+import hashlib
+import json
+
+from django.db.models import Count, Max, Sum, Q
+from django.forms.models import model_to_dict
+from django.http import JsonResponse, HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag, http_date
+from django.views import View
+
+from .bulk import delete_categories, delete_tasks
+from .changelog import changes_since, current_token, StaleToken
+from .filters import filter_tasks
+from .forms import TaskForm, CategoryForm, NotificationForm
+from .models import Task, Category, Notification
+from .notifications import delete_notifications
+from .pagination import CursorPaginator, InvalidCursor
+
+
+class ApiError(Exception):
+    def __init__(self, message, status=400, **extra):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+        self.extra = extra
+
+
+def json_error(message, status, **extra):
+    return JsonResponse({'error': message, **extra}, status=status)
+
+
+class ApiView(View):
+    """
+    Base for the JSON API. Session authenticated (unauthenticated requests get
+    a 401 instead of the login redirect); writes need the usual CSRF token.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return json_error('Authentication required.', 401)
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        except ApiError as e:
+            return json_error(e.message, e.status, **e.extra)
+
+    def parse_body(self):
+        try:
+            payload = json.loads(self.request.body or b'{}')
+        except ValueError:
+            raise ApiError('Request body must be valid JSON.')
+        if not isinstance(payload, dict):
+            raise ApiError('Request body must be a JSON object.')
+        return payload
+
+
+class ResourceMixin:
+    """
+    Describes one model for the API: the fields it exposes, its keyset
+    ordering, the ModelForm used for writes and how to build cheap
+    validators (ETag / Last-Modified) without serializing anything.
+    """
+    model = None
+    fields = ()
+    ordering = ()
+    form_class = None
+    page_size = 50
+    max_page_size = 200
+
+    def get_queryset(self):
+        return self.model.objects.for_user(self.request.user)
+
+    def get_form_kwargs(self):
+        return {}
+
+    def get_fields(self):
+        """
+        Sparse fieldsets: ?fields=id,title limits the keys in every object.
+        """
+        requested = self.request.GET.get('fields')
+        if not requested:
+            return list(self.fields)
+        fields = [name.strip() for name in requested.split(',') if name.strip()]
+        unknown = sorted(set(fields) - set(self.fields))
+        if unknown:
+            raise ApiError(f"Unknown fields: {', '.join(unknown)}", available=list(self.fields))
+        return fields
+
+    def rows(self, queryset, fields):
+        # values() rows, so no model instances are built; ordering columns ride along for the cursor
+        ordering_fields = [name.lstrip('-') for name in self.ordering] + ['id']
+        return queryset.values(*dict.fromkeys(fields + ordering_fields))
+
+    def serialize(self, row, fields):
+        return {name: row[name] for name in fields}
+
+    def collection_signature(self, queryset):
+        """
+        Returns (signature, last_modified) for a filtered collection. Anything
+        that changes the serialized collection must change the signature.
+        """
+        raise NotImplementedError
+
+    def delete_rows(self, queryset):
+        """
+        Deletes the (owner-scoped) rows in `queryset` through the set-based
+        delete helper for the model; returns how many were deleted.
+        """
+        raise NotImplementedError
+
+    def conditional(self, signature, last_modified=None):
+        """
+        Returns a 304 response when the client's validators still match,
+        together with the ETag / Last-Modified to attach otherwise.
+        """
+        etag = quote_etag(hashlib.md5(
+            f'{self.request.user.pk}:{self.request.get_full_path()}:{signature}'.encode(),
+            usedforsecurity=False,
+        ).hexdigest())
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        return get_conditional_response(self.request, etag=etag, last_modified=timestamp), etag, timestamp
+
+    def with_validators(self, response, etag, timestamp):
+        response.headers['ETag'] = etag
+        if timestamp is not None:
+            response.headers['Last-Modified'] = http_date(timestamp)
+        # Always revalidate: the response is per user and changes with every write
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def save_form(self, payload, instance=None):
+        data = payload
+        if instance is not None:
+            # PUT and PATCH both merge into the stored values; omitted fields are kept
+            data = {**model_to_dict(instance, fields=self.form_class._meta.fields), **payload}
+        form = self.form_class(data=data, instance=instance, **self.get_form_kwargs())
+        if not form.is_valid():
+            raise ApiError('Validation failed.', errors=form.errors.get_json_data())
+        if instance is None:
+            form.instance.user = self.request.user
+        return form.save()
+
+
+class ResourceListView(ResourceMixin, ApiView):
+
+    def filter_queryset(self, queryset):
+        return queryset
+
+    def get(self, request, *args, **kwargs):
+        fields = self.get_fields()
+        queryset = self.filter_queryset(self.get_queryset())
+
+        # Collections only honor If-None-Match: Last-Modified can't see deletions
+        signature, last_modified = self.collection_signature(queryset)
+        not_modified, etag, timestamp = self.conditional(signature)
+        if not_modified is not None:
+            return self.with_validators(not_modified, etag, None)
+
+        try:
+            page_size = min(int(request.GET.get('page_size', self.page_size)), self.max_page_size)
+            if page_size < 1:
+                raise ValueError
+        except ValueError:
+            raise ApiError('page_size must be a positive integer.')
+        paginator = CursorPaginator(self.rows(queryset, fields), page_size, self.ordering)
+        try:
+            page = paginator.page(request.GET.get('cursor'))
+        except InvalidCursor:
+            raise ApiError('Invalid cursor.')
+
+        response = JsonResponse({
+            'results': [self.serialize(row, fields) for row in page],
+            'next': page.next_cursor,
+            'previous': page.previous_cursor,
+        })
+        if last_modified is not None:
+            timestamp = int(last_modified.timestamp())
+        return self.with_validators(response, etag, timestamp)
+
+    def post(self, request, *args, **kwargs):
+        instance = self.save_form(self.parse_body())
+        row = self.rows(self.get_queryset().filter(pk=instance.pk), list(self.fields)).get()
+        return JsonResponse(self.serialize(row, list(self.fields)), status=201)
+
+
+class ResourceDetailView(ResourceMixin, ApiView):
+
+    def get_row(self, fields):
+        try:
+            return self.rows(self.get_queryset().filter(pk=self.kwargs['pk']), fields).get()
+        except self.model.DoesNotExist:
+            raise ApiError('Not found.', 404)
+
+    def get_instance(self):
+        try:
+            return self.get_queryset().get(pk=self.kwargs['pk'])
+        except self.model.DoesNotExist:
+            raise ApiError('Not found.', 404)
+
+    def row_signature(self, row):
+        return json.dumps(row, sort_keys=True, default=str)
+
+    def get(self, request, *args, **kwargs):
+        fields = self.get_fields()
+        row = self.get_row(fields)
+        last_modified = row.get('updated_at')
+        not_modified, etag, timestamp = self.conditional(self.row_signature(row), last_modified)
+        if not_modified is not None:
+            return self.with_validators(not_modified, etag, timestamp)
+        return self.with_validators(JsonResponse(self.serialize(row, fields)), etag, timestamp)
+
+    def put(self, request, *args, **kwargs):
+        instance = self.save_form(self.parse_body(), self.get_instance())
+        fields = list(self.fields)
+        return JsonResponse(self.serialize(self.rows(self.get_queryset().filter(pk=instance.pk), fields).get(), fields))
+
+    patch = put
+
+    def delete(self, request, *args, **kwargs):
+        if not self.delete_rows(self.get_queryset().filter(pk=self.kwargs['pk'])):
+            raise ApiError('Not found.', 404)
+        return HttpResponse(status=204)
+
+
+# --- Tasks ---
+class TaskResourceMixin:
+    model = Task
+    fields = ('id', 'title', 'description', 'category', 'due_date', 'completed', 'priority', 'created_at', 'updated_at')
+    ordering = ('completed', 'due_date', '-created_at')
+    form_class = TaskForm
+
+    def get_form_kwargs(self):
+        return {'user': self.request.user}
+
+    def rows(self, queryset, fields):
+        # updated_at drives Last-Modified on the detail endpoint
+        return super().rows(queryset, fields + ['updated_at'])
+
+    def collection_signature(self, queryset):
+        aggregates = queryset.order_by().aggregate(count=Count('pk'), last_modified=Max('updated_at'))
+        return f"{aggregates['count']}:{aggregates['last_modified']}", aggregates['last_modified']
+
+    def delete_rows(self, queryset):
+        return delete_tasks(self.request.user.pk, queryset)
+
+
+class TaskListApiView(TaskResourceMixin, ResourceListView):
+
+    def filter_queryset(self, queryset):
+        # Same filters as the task list page: status, category, q, due_date_filter
+        return filter_tasks(self.request.user, self.request.GET)
+
+
+class TaskDetailApiView(TaskResourceMixin, ResourceDetailView):
+    pass
+
+
+# --- Categories ---
+class CategoryResourceMixin:
+    model = Category
+    fields = ('id', 'name', 'description')
+    ordering = ('name',)
+    form_class = CategoryForm
+
+    def collection_signature(self, queryset):
+        # Categories carry no timestamp; a user has few of them, so hash the raw rows
+        rows = list(queryset.order_by('pk').values_list('pk', 'name', 'description'))
+        return hashlib.md5(repr(rows).encode(), usedforsecurity=False).hexdigest(), None
+
+    def delete_rows(self, queryset):
+        return delete_categories(self.request.user.pk, queryset)
+
+    def save_form(self, payload, instance=None):
+        # The unique (user, name) constraint isn't covered by CategoryForm, which excludes user
+        name = payload.get('name', instance.name if instance else None)
+        duplicates = Category.objects.for_user(self.request.user).filter(name=name)
+        if instance is not None:
+            duplicates = duplicates.exclude(pk=instance.pk)
+        if name and duplicates.exists():
+            raise ApiError('Validation failed.', errors={'name': [{'message': 'You already have a category with this name.', 'code': 'unique'}]})
+        return super().save_form(payload, instance)
+
+
+class CategoryListApiView(CategoryResourceMixin, ResourceListView):
+    pass
+
+
+class CategoryDetailApiView(CategoryResourceMixin, ResourceDetailView):
+    pass
+
+
+# --- Notifications ---
+class NotificationResourceMixin:
+    model = Notification
+    fields = ('id', 'task', 'message', 'notification_type', 'is_read', 'created_at')
+    ordering = ('-created_at',)
+    form_class = NotificationForm
+
+    def get_form_kwargs(self):
+        return {'user': self.request.user}
+
+    def collection_signature(self, queryset):
+        unread = Q(is_read=False)
+        aggregates = queryset.order_by().aggregate(
+            count=Count('pk'), newest=Max('created_at'),
+            unread=Count('pk', filter=unread), unread_ids=Sum('pk', filter=unread),
+        )
+        return ':'.join(str(value) for value in aggregates.values()), None
+
+    def delete_rows(self, queryset):
+        return delete_notifications(self.request.user.pk, queryset)
+
+
+class NotificationListApiView(NotificationResourceMixin, ResourceListView):
+
+    def filter_queryset(self, queryset):
+        is_read = self.request.GET.get('is_read')
+        if is_read in ('true', 'false'):
+            queryset = queryset.filter(is_read=is_read == 'true')
+        return queryset
+
+
+class NotificationDetailApiView(NotificationResourceMixin, ResourceDetailView):
+    pass
+
+
+# --- Sync ---
+class SyncApiView(ApiView):
+    """
+    Delta feed for clients keeping a local copy: GET ?since=<token> returns
+    the records created, updated or deleted since that token plus the next
+    token. Without a token, or with one older than the pruned change log,
+    the response says `reset` and the client refetches the collections.
+    """
+    resources = (
+        ('tasks', TaskResourceMixin),
+        ('categories', CategoryResourceMixin),
+        ('notifications', NotificationResourceMixin),
+    )
+    limit = 500
+
+    def reset(self):
+        # Taken before the client refetches, so nothing written meanwhile is missed
+        return JsonResponse({'reset': True, 'token': str(current_token()), 'more': False})
+
+    def get(self, request, *args, **kwargs):
+        since = request.GET.get('since')
+        if not since:
+            return self.reset()
+        try:
+            since = int(since)
+            if since < 0:
+                raise ValueError
+        except ValueError:
+            raise ApiError('Invalid sync token.')
+        try:
+            changes, token, more = changes_since(request.user.pk, since, self.limit)
+        except StaleToken:
+            return self.reset()
+
+        payload = {'reset': False, 'token': str(token), 'more': more}
+        for name, resource in self.resources:
+            actions = changes.get(resource.model._meta.model_name, {})
+            upserted = [pk for pk, action in actions.items() if action == 'upsert']
+            rows = list(resource.model.objects.for_user(request.user).filter(pk__in=upserted).values(*resource.fields)) if upserted else []
+            # Anything logged but no longer there was deleted after its last upsert
+            found = {row['id'] for row in rows}
+            payload[name] = {'upserted': rows, 'deleted': sorted(pk for pk in actions if pk not in found)}
+        return JsonResponse(payload)
@@ -0,0 +1,326 @@
+# tasks/benchmark.py
+import asyncio
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import sqlite3
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from django.core.cache import cache
+from django.db import connection, connections
+from django.test import AsyncClient, Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import urlencode
+
+from task_manager_project.database import sqlite_pragmas
+
+BUDGETS_PATH = Path(__file__).with_name('benchmark_budgets.json')
+
+TASK_LIST_FILTERS = {
+    'status': ('', 'pending', 'completed'),
+    'category': ('', '{category}'),
+    'due_date_filter': ('', 'overdue', 'today', 'this_week', 'later', 'no_due_date'),
+    'q': ('', 'report'),
+}
+
+
+@dataclass
+class Measurement:
+    name: str
+    # Budget entry the scenario is checked against; several scenarios can share one
+    budget: str
+    # Queries of a cold request: caches cleared first, so the worst case
+    queries: int = 0
+    # Wall-clock milliseconds of the warm requests that followed
+    timings: list = field(default_factory=list)
+
+    @property
+    def p50(self):
+        return percentile(self.timings, 50)
+
+    @property
+    def p95(self):
+        return percentile(self.timings, 95)
+
+
+def percentile(values, pct):
+    """
+    Nearest-rank percentile; 0.0 for no values.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(math.ceil(pct / 100 * len(ordered)) - 1, 0)]
+
+
+def load_budgets(path=BUDGETS_PATH):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def scenarios(user):
+    """
+    Yields (name, budget, method, url, data) for the request hot paths of
+    `user`: the task list under every filter combination, the dashboard,
+    category and notification lists, and the create / update flows.
+    """
+    task = user.tasks.order_by('pk').first()
+    category = user.categories.order_by('pk').first()
+    category_id = str(category.pk) if category else ''
+
+    task_list = reverse('task_list')
+    for values in itertools.product(*TASK_LIST_FILTERS.values()):
+        params = {
+            key: value.format(category=category_id)
+            for key, value in zip(TASK_LIST_FILTERS, values) if value
+        }
+        # Named with the placeholder so scenarios line up across datasets
+        name = 'task_list?' + urlencode(dict(zip(TASK_LIST_FILTERS, values))) if any(values) else 'task_list'
+        yield name, 'task_list', 'get', f'{task_list}?{urlencode(params)}', None
+
+    yield 'dashboard', 'dashboard', 'get', reverse('dashboard'), None
+    yield 'category_list', 'category_list', 'get', reverse('category_list'), None
+    yield 'notification_list', 'notification_list', 'get', reverse('notification_list'), None
+    yield 'task_create_form', 'task_form', 'get', reverse('task_create'), None
+    due = timezone.localtime() + timezone.timedelta(days=3)
+    yield 'task_create', 'task_create', 'post', reverse('task_create'), {
+        'title': 'Benchmark task', 'category': category_id, 'due_date': due.strftime('%Y-%m-%dT%H:%M'),
+    }
+    if task is not None:
+        yield 'task_update_form', 'task_form', 'get', reverse('task_update', args=[task.pk]), None
+        yield 'task_update', 'task_update', 'post', reverse('task_update', args=[task.pk]), {
+            'title': task.title, 'category': category_id, 'due_date': due.strftime('%Y-%m-%dT%H:%M'),
+        }
+
+
+def measure(client, name, budget, method, url, data=None, iterations=5):
+    """
+    Runs one scenario: a cold request (cache cleared) whose queries are
+    counted, then `iterations` timed warm requests.
+    """
+    measurement = Measurement(name, budget)
+    request = getattr(client, method)
+    cache.clear()
+    with CaptureQueriesContext(connection) as queries:
+        response = request(url, data or {})
+    if response.status_code >= 400:
+        raise AssertionError(f"{name}: {method.upper()} {url} answered {response.status_code}")
+    measurement.queries = len(queries)
+
+    for _ in range(iterations):
+        started = time.perf_counter()
+        request(url, data or {})
+        measurement.timings.append((time.perf_counter() - started) * 1000)
+    return measurement
+
+
+def run_benchmarks(client, user, iterations=5):
+    """
+    Measures every scenario for `user` (whom `client` must be logged in as).
+    """
+    return [
+        measure(client, name, budget, method, url, data, iterations)
+        for name, budget, method, url, data in scenarios(user)
+    ]
+
+
+def check_budgets(measurements, budgets, enforce_latency=False):
+    """
+    Returns a list of budget violations. Query budgets always count; latency
+    budgets only with `enforce_latency`, since timings depend on the machine.
+    """
+    failures = []
+    for m in measurements:
+        budget = budgets.get(m.budget)
+        if budget is None:
+            failures.append(f"{m.name}: no budget named '{m.budget}'")
+            continue
+        if m.queries > budget['queries']:
+            failures.append(f"{m.name}: {m.queries} queries, budget {budget['queries']}")
+        if enforce_latency and 'p95_ms' in budget and m.p95 > budget['p95_ms']:
+            failures.append(f"{m.name}: p95 {m.p95:.1f}ms, budget {budget['p95_ms']}ms")
+    return failures
+
+
+def format_report(measurements, label=''):
+    lines = [f"== {label}" if label else '', f"{'scenario':<70} {'queries':>7} {'p50 ms':>8} {'p95 ms':>8}"]
+    for m in measurements:
+        lines.append(f"{m.name:<70} {m.queries:>7} {m.p50:>8.1f} {m.p95:>8.1f}")
+    return '\n'.join(line for line in lines if line) + '\n'
+
+
+# SQLite write concurrency: (BEGIN statement, per-connection PRAGMAs) of each compared setup.
+# "default" is what Django does without OPTIONS: rollback journal, deferred transactions and
+# sqlite3's 5 second busy timeout.
+SQLITE_WRITE_MODES = {
+    'default': ('BEGIN', []),
+    'tuned': ('BEGIN IMMEDIATE', sqlite_pragmas()),
+}
+
+
+@dataclass
+class WriteMeasurement:
+    mode: str
+    processes: int
+    committed: int = 0
+    # Transactions that failed with "database is locked" / busy
+    locked: int = 0
+    seconds: float = 0.0
+
+    @property
+    def writes_per_second(self):
+        return self.committed / self.seconds if self.seconds else 0.0
+
+
+def sqlite_write_worker(path, begin, pragmas, worker, writes):
+    """
+    One writer process: `writes` transactions that read the worker's row
+    count, then insert a row, like a Django save() behind a validation query.
+    Returns (committed, locked).
+    """
+    conn = sqlite3.connect(path, isolation_level=None)
+    for pragma in pragmas:
+        conn.execute(pragma)
+    committed = locked = 0
+    for index in range(writes):
+        try:
+            conn.execute(begin)
+            (count,) = conn.execute('SELECT COUNT(*) FROM bench_task WHERE worker = ?', (worker,)).fetchone()
+            conn.execute(
+                'INSERT INTO bench_task (worker, title, position) VALUES (?, ?, ?)',
+                (worker, f'Task {index} of worker {worker}', count),
+            )
+            conn.execute('COMMIT')
+            committed += 1
+        except sqlite3.OperationalError as exc:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            if 'locked' not in str(exc) and 'busy' not in str(exc):
+                raise
+            locked += 1
+    conn.close()
+    return committed, locked
+
+
+def benchmark_sqlite_writes(mode, processes=4, writes=200, directory=None):
+    """
+    Runs `processes` concurrent writers against a fresh SQLite file set up
+    as SQLITE_WRITE_MODES[mode] and returns a WriteMeasurement.
+    """
+    begin, pragmas = SQLITE_WRITE_MODES[mode]
+    measurement = WriteMeasurement(mode, processes)
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        path = os.path.join(tmp, f'{mode}.sqlite3')
+        conn = sqlite3.connect(path)
+        for pragma in pragmas:
+            conn.execute(pragma)
+        conn.execute(
+            'CREATE TABLE bench_task (id INTEGER PRIMARY KEY, worker INTEGER, title TEXT, position INTEGER)'
+        )
+        conn.execute('CREATE INDEX bench_task_worker ON bench_task (worker)')
+        conn.commit()
+        conn.close()
+
+        with multiprocessing.get_context().Pool(processes) as pool:
+            started = time.perf_counter()
+            results = pool.starmap(
+                sqlite_write_worker, [(path, begin, pragmas, worker, writes) for worker in range(processes)]
+            )
+            measurement.seconds = time.perf_counter() - started
+    measurement.committed = sum(committed for committed, _ in results)
+    measurement.locked = sum(locked for _, locked in results)
+    return measurement
+
+
+# Sync WSGI vs async ASGI throughput: the pages that have async variants (TASKS_ASYNC_VIEWS)
+THROUGHPUT_PAGES = ('task_list', 'dashboard', 'notification_list')
+
+
+@dataclass
+class Throughput:
+    mode: str
+    concurrency: int
+    requests: int = 0
+    errors: int = 0
+    seconds: float = 0.0
+    timings: list = field(default_factory=list)
+
+    @property
+    def requests_per_second(self):
+        return self.requests / self.seconds if self.seconds else 0.0
+
+    @property
+    def p50(self):
+        return percentile(self.timings, 50)
+
+    @property
+    def p95(self):
+        return percentile(self.timings, 95)
+
+
+def worker_paths(paths, requests, concurrency, worker):
+    # Spread `requests` over the workers, each cycling through the pages from a different one
+    count = requests // concurrency + (worker < requests % concurrency)
+    return [paths[(worker + index) % len(paths)] for index in range(count)]
+
+
+def wsgi_throughput(user, paths, concurrency=50, requests=1000):
+    """
+    Sync handler: `concurrency` threads, each with its own client (and
+    database connection), as a threaded WSGI server would run them.
+    """
+    result = Throughput('wsgi', concurrency)
+
+    def work(worker):
+        client = Client()
+        client.force_login(user)
+        timings, errors = [], 0
+        try:
+            for path in worker_paths(paths, requests, concurrency, worker):
+                started = time.perf_counter()
+                errors += client.get(path).status_code >= 400
+                timings.append((time.perf_counter() - started) * 1000)
+        finally:
+            connections.close_all()
+        return timings, errors
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        outcomes = list(pool.map(work, range(concurrency)))
+    result.seconds = time.perf_counter() - started
+    for timings, errors in outcomes:
+        result.timings += timings
+        result.errors += errors
+    result.requests = len(result.timings)
+    return result
+
+
+async def asgi_throughput(user, paths, concurrency=50, requests=1000):
+    """
+    Async handler: `concurrency` clients as tasks on one event loop, as an
+    ASGI server would run them.
+    """
+    result = Throughput('asgi', concurrency)
+
+    async def work(worker):
+        client = AsyncClient()
+        await client.aforce_login(user)
+        for path in worker_paths(paths, requests, concurrency, worker):
+            started = time.perf_counter()
+            response = await client.get(path)
+            result.timings.append((time.perf_counter() - started) * 1000)
+            result.errors += response.status_code >= 400
+
+    started = time.perf_counter()
+    await asyncio.gather(*(work(worker) for worker in range(concurrency)))
+    result.seconds = time.perf_counter() - started
+    result.requests = len(result.timings)
+    return result
@@ -0,0 +1,94 @@
+# tasks/bulk.py
+from django.db import transaction
+from django.utils import timezone
+
+from .changelog import record_changes
+from .dashboard import invalidate_dashboard_snapshot
+from .models import Task, Category, Notification
+from .notifications import mark_notifications_read, invalidate_unread_count
+
+BULK_ACTIONS = ('complete', 'reopen', 'recategorize', 'delete')
+
+
+def apply_bulk_action(user, queryset, action, category=None):
+    """
+    Applies `action` to every task in `queryset` (already limited to `user`'s
+    tasks) with a single UPDATE or DELETE. The per-task post_save work is done
+    set-based instead: reminders of completed tasks are cleared and their
+    notifications marked read in one UPDATE each, and the dashboard snapshot
+    is dropped once. `updated_at` is bumped explicitly (QuerySet.update skips
+    auto_now) so the send_reminders scan sees reopened tasks, and the changed
+    tasks are written to the sync change log in one INSERT.
+
+    Returns the number of tasks affected.
+    """
+    if action not in BULK_ACTIONS:
+        raise ValueError(f"Unknown bulk action: {action}")
+    now = timezone.now()
+    # Re-select by pk through a subquery: each statement sees the selection as it was
+    # before that statement ran, even when the filter uses the columns being changed
+    tasks = Task.objects.for_user(user).filter(pk__in=queryset.order_by().values('pk'))
+
+    with transaction.atomic():
+        if action == 'delete':
+            affected = delete_tasks(user.pk, tasks)
+        else:
+            if action == 'complete':
+                # Before the UPDATE, while a status filter still matches the selection
+                mark_notifications_read(user.pk, Notification.objects.for_user(user).filter(task__in=tasks))
+                tasks, changes = tasks.filter(completed=False), dict(completed=True, has_active_reminder_notification=False)
+            elif action == 'reopen':
+                tasks, changes = tasks.filter(completed=True), dict(completed=False)
+            else:
+                changes = dict(category=category)
+            # The ids are needed for the change log; updating by them also pins the selection
+            ids = list(tasks.values_list('pk', flat=True))
+            affected = Task.objects.filter(pk__in=ids).update(updated_at=now, **changes)
+            record_changes(user.pk, Task, ids)
+
+    invalidate_dashboard_snapshot(user.pk)
+    return affected
+
+
+def delete_tasks(user_id, queryset):
+    """
+    Deletes the tasks in `queryset` (all belonging to `user_id`) together
+    with their notifications: one DELETE each (no delete signals are
+    connected, so Django doesn't load the rows), one change-log INSERT and
+    the owner's cached unread count and dashboard snapshot dropped once.
+    Every task delete goes through here. Returns the number deleted.
+    """
+    ids = list(queryset.order_by().values_list('pk', flat=True))
+    if not ids:
+        return 0
+    with transaction.atomic():
+        notification_ids = list(Notification.objects.filter(task_id__in=ids).order_by().values_list('pk', flat=True))
+        # The delete collector still selects the tasks; it only needs their keys
+        _, deleted = Task.objects.filter(pk__in=ids).only('pk').delete()
+        record_changes(user_id, Notification, notification_ids, action='delete')
+        record_changes(user_id, Task, ids, action='delete')
+    if notification_ids:
+        invalidate_unread_count(user_id)
+    invalidate_dashboard_snapshot(user_id)
+    return deleted.get(Task._meta.label, 0)
+
+
+def delete_categories(user_id, queryset):
+    """
+    Deletes the categories in `queryset` (all belonging to `user_id`). Their
+    tasks are unlinked with one UPDATE and logged here, rather than by the
+    SET_NULL the delete collector would apply, and get a fresh updated_at,
+    which the API's ETag / Last-Modified validators and the send_reminders
+    scan go by. Returns the number deleted.
+    """
+    ids = list(queryset.order_by().values_list('pk', flat=True))
+    if not ids:
+        return 0
+    with transaction.atomic():
+        task_ids = list(Task.objects.filter(category_id__in=ids).order_by().values_list('pk', flat=True))
+        Task.objects.filter(pk__in=task_ids).update(category=None, updated_at=timezone.now())
+        deleted, _ = Category.objects.filter(pk__in=ids).only('pk').delete()
+        record_changes(user_id, Task, task_ids)
+        record_changes(user_id, Category, ids, action='delete')
+    invalidate_dashboard_snapshot(user_id)
+    return deleted
@@ -0,0 +1,91 @@
+# tasks/changelog.py
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from . import live
+from .models import ChangeLogEntry, Notification
+
+
+class StaleToken(Exception):
+    """
+    The sync token predates the pruned part of the change log; the client has
+    to refetch everything.
+    """
+
+
+def record_changes(user_id, model, object_ids, action='upsert'):
+    """
+    Appends one change-log entry per object with a single INSERT. Called from
+    the save signals, the delete helpers in bulk.py / notifications.py and
+    every path that writes with QuerySet.update() or bulk_create().
+    """
+    ChangeLogEntry.objects.bulk_create([
+        ChangeLogEntry(user_id=user_id, model=model._meta.model_name, object_id=pk, action=action)
+        for pk in object_ids
+    ])
+    if model is Notification:
+        # Connected notification streams pick the change up once it's visible
+        transaction.on_commit(live.live_notifications.wake)
+
+
+def visible_entries():
+    # Entries still inside the settle window may yet be joined by lower ids from slower transactions
+    queryset = ChangeLogEntry.objects.all()
+    if settings.TASKS_SYNC_SETTLE_SECONDS:
+        queryset = queryset.filter(
+            created_at__lte=timezone.now() - timezone.timedelta(seconds=settings.TASKS_SYNC_SETTLE_SECONDS)
+        )
+    return queryset
+
+
+def current_token():
+    """
+    The newest visible entry's id: a client holding it has seen everything.
+    """
+    return visible_entries().order_by('-pk').values_list('pk', flat=True).first() or 0
+
+
+def changes_since(user_id, since, limit=500):
+    """
+    Returns ({model: {object_id: action}}, token, more) for the user's changes
+    after token `since`, compacted so only an object's last action is kept.
+    Raises StaleToken when entries after `since` may already have been pruned.
+    """
+    # Pruning always keeps the newest entry, so an empty log means nothing was ever recorded
+    oldest = ChangeLogEntry.objects.order_by('pk').values_list('pk', flat=True).first()
+    stale = since > 0 if oldest is None else since < oldest - 1
+    if stale:
+        raise StaleToken(since)
+
+    head = current_token()
+    entries = list(
+        visible_entries().filter(user_id=user_id, pk__gt=since, pk__lte=head)
+        .order_by('pk').values_list('pk', 'model', 'object_id', 'action')[:limit + 1]
+    )
+    more = len(entries) > limit
+    entries = entries[:limit]
+
+    changes = {}
+    for _, model, object_id, action in entries:
+        changes.setdefault(model, {})[object_id] = action
+    # Nothing more for this user: jump to the head so the token doesn't go stale while they're idle
+    token = entries[-1][0] if more else max(head, since)
+    return changes, token, more
+
+
+def prune_change_log(older_than):
+    """
+    Deletes entries created before `older_than`, always keeping the newest
+    one so token staleness can still be told apart from an empty log.
+    Returns the number of entries deleted.
+    """
+    newest = ChangeLogEntry.objects.order_by('-pk').values_list('pk', flat=True).first()
+    if newest is None:
+        return 0
+    boundary = (
+        ChangeLogEntry.objects.filter(created_at__gte=older_than).order_by('pk').values_list('pk', flat=True).first()
+        or newest
+    )
+    deleted, _ = ChangeLogEntry.objects.filter(pk__lt=boundary).delete()
+    return deleted
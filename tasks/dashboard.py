@@ -0,0 +1,149 @@
+# tasks/dashboard.py
+import asyncio
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Min, Q, Case, When, Value, CharField
+from django.utils import timezone
+
+from .models import Task
+
+DUE_SOON_WINDOW = timezone.timedelta(days=7)
+
+
+async def alist(queryset):
+    return [row async for row in queryset]
+
+
+def snapshot_cache_key(user_id):
+    return f'dashboard:snapshot:{user_id}'
+
+
+def dashboard_queries(user, now):
+    """
+    The three independent queries behind the dashboard, unevaluated: the
+    counter aggregates (kwargs for aggregate()), the pending tasks due
+    within the window and the per-category task counts.
+    """
+    user_tasks = Task.objects.for_user(user)
+    one_week_from_now = now + DUE_SOON_WINDOW
+
+    # All counters in one pass over the user's tasks
+    overdue = Q(completed=False, due_date__lt=now)
+    due_soon = Q(completed=False, due_date__gte=now, due_date__lte=one_week_from_now)
+    counters = dict(
+        total_tasks=Count('pk'),
+        completed_tasks=Count('pk', filter=Q(completed=True)),
+        pending_tasks=Count('pk', filter=Q(completed=False)),
+        overdue_tasks_count=Count('pk', filter=overdue),
+        tasks_due_soon_count=Count('pk', filter=due_soon),
+        next_due_after_window=Min('due_date', filter=Q(completed=False, due_date__gt=one_week_from_now)),
+    )
+
+    # One fetch for both reminder lists, split in Python: overdue rows come first by due_date
+    reminder_tasks = user_tasks.filter(
+        completed=False,
+        due_date__lte=one_week_from_now
+    ).for_list().order_by('due_date')
+
+    tasks_by_category = user_tasks.annotate(
+        category_name=Case(
+            When(category__isnull=False, then='category__name'),
+            default=Value('No Category'),
+            output_field=CharField()
+        )
+    ).values('category_name').annotate(
+        count=Count('category_name')
+    ).order_by('category_name')
+
+    return user_tasks, counters, reminder_tasks, tasks_by_category
+
+
+def assemble_snapshot(counts, reminder_tasks, tasks_by_category, now):
+    overdue_tasks_list = []
+    tasks_due_soon_list = []
+    for task in reminder_tasks:
+        if task.due_date < now:
+            overdue_tasks_list.append(task)
+        else:
+            tasks_due_soon_list.append(task)
+    next_due_after_window = counts.pop('next_due_after_window')
+
+    # Time-based transitions don't fire any signal, so bound the cache lifetime by the next one
+    transitions = []
+    if tasks_due_soon_list:
+        transitions.append(tasks_due_soon_list[0].due_date)
+    if next_due_after_window:
+        transitions.append(next_due_after_window - DUE_SOON_WINDOW)
+    expires_at = min(transitions) if transitions else None
+
+    return {
+        **counts,
+        'overdue_tasks_list': overdue_tasks_list,
+        'tasks_due_soon_list': tasks_due_soon_list,
+        'tasks_by_category': list(tasks_by_category),
+    }, expires_at
+
+
+def build_dashboard_snapshot(user):
+    """
+    Computes everything the dashboard shows for `user`, plus the moment the
+    snapshot goes stale on its own (a pending task turning overdue or
+    entering the due-soon window).
+    """
+    now = timezone.now()
+    user_tasks, counters, reminder_tasks, tasks_by_category = dashboard_queries(user, now)
+    return assemble_snapshot(user_tasks.aggregate(**counters), list(reminder_tasks), list(tasks_by_category), now)
+
+
+async def abuild_dashboard_snapshot(user):
+    """
+    build_dashboard_snapshot() on the async ORM, with the three queries
+    gathered rather than awaited one after the other.
+    """
+    now = timezone.now()
+    user_tasks, counters, reminder_tasks, tasks_by_category = dashboard_queries(user, now)
+
+    counts, reminders, by_category = await asyncio.gather(
+        user_tasks.aaggregate(**counters), alist(reminder_tasks), alist(tasks_by_category),
+    )
+    return assemble_snapshot(counts, reminders, by_category, now)
+
+
+def snapshot_timeout(expires_at):
+    timeout = settings.DASHBOARD_CACHE_TIMEOUT
+    if expires_at is not None:
+        timeout = min(timeout, max(int((expires_at - timezone.now()).total_seconds()) + 1, 1))
+    return timeout
+
+
+def get_dashboard_snapshot(user):
+    """
+    Returns the cached dashboard snapshot for `user`, building it on a miss.
+    """
+    key = snapshot_cache_key(user.pk)
+    snapshot = cache.get(key)
+    if snapshot is None:
+        snapshot, expires_at = build_dashboard_snapshot(user)
+        cache.set(key, snapshot, snapshot_timeout(expires_at))
+    return snapshot
+
+
+async def aget_dashboard_snapshot(user):
+    key = snapshot_cache_key(user.pk)
+    snapshot = await cache.aget(key)
+    if snapshot is None:
+        snapshot, expires_at = await abuild_dashboard_snapshot(user)
+        await cache.aset(key, snapshot, snapshot_timeout(expires_at))
+    return snapshot
+
+
+def invalidate_dashboard_snapshot(user_id):
+    """
+    Drops the user's snapshot now and again once the surrounding transaction
+    commits, so a request racing the write can't cache pre-commit data.
+    """
+    key = snapshot_cache_key(user_id)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
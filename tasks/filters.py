@@ -0,0 +1,57 @@
+# tasks/filters.py
+from django.utils import timezone
+
+from .models import Task, Category
+from .search import search_tasks
+
+# Query parameters understood by filter_tasks(); used to carry the current filter around
+TASK_FILTER_PARAMS = ('status', 'category', 'q', 'due_date_filter')
+
+
+def filter_tasks(user, params):
+    """
+    Returns the user's tasks narrowed by the task list filters in `params`
+    (a QueryDict or dict): status, category, q and due_date_filter.
+    """
+    queryset = Task.objects.for_user(user)
+
+    status = params.get('status')
+    category_id = params.get('category')
+    search_query = params.get('q')
+    due_date_filter = params.get('due_date_filter')
+
+    if status == 'completed':
+        queryset = queryset.filter(completed=True)
+    elif status == 'pending':
+        queryset = queryset.filter(completed=False)
+
+    if category_id:
+        try:
+            category = Category.objects.for_user(user).get(pk=category_id)
+            queryset = queryset.filter(category=category)
+        except (Category.DoesNotExist, ValueError):
+            pass
+
+    if search_query:
+        # Full-text index (prefix matching) when available, icontains otherwise
+        queryset = search_tasks(queryset, search_query)
+
+    if due_date_filter:
+        now = timezone.now()
+        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        today_end = now.replace(hour=23, minute=59, second=59, microsecond=999999)
+
+        if due_date_filter == 'overdue':
+            queryset = queryset.filter(completed=False, due_date__lt=now)
+        elif due_date_filter == 'today':
+            queryset = queryset.filter(due_date__range=(today_start, today_end))
+        elif due_date_filter == 'this_week':
+            end_of_week = today_end + timezone.timedelta(days=6)
+            queryset = queryset.filter(due_date__range=(now, end_of_week))
+        elif due_date_filter == 'later':
+            end_of_week = today_end + timezone.timedelta(days=6)
+            queryset = queryset.filter(due_date__gt=end_of_week)
+        elif due_date_filter == 'no_due_date':
+            queryset = queryset.filter(due_date__isnull=True)
+
+    return queryset
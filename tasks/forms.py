@@ -1,6 +1,6 @@
 # tasks/forms.py
 from django import forms
-from .models import Task, Category
+from .models import Task, Category, Notification
 
 class TaskForm(forms.ModelForm):
     class Meta:
@@ -24,7 +24,8 @@ class TaskForm(forms.ModelForm):
 
         # Filter category choices based on the current user's categories
         if self.user:
-            self.fields['category'].queryset = Category.objects.filter(user=self.user)
+            # Choice labels use Category.__str__, which shows the owner
+            self.fields['category'].queryset = Category.objects.for_user(self.user).with_related()
         else:
             # If no user is provided (e.g., in admin or other contexts), show no categories
             self.fields['category'].queryset = Category.objects.none()
@@ -46,3 +47,39 @@ class CategoryForm(forms.ModelForm):
         for field_name, field in self.fields.items():
             if isinstance(field.widget, (forms.TextInput, forms.Textarea)):
                 field.widget.attrs.update({'class': 'mt-1 block w-full rounded-md border-gray-300 shadow-sm focus:border-blue-500 focus:ring-blue-500 sm:text-sm'})
+
+class NotificationForm(forms.ModelForm):
+    class Meta:
+        model = Notification
+        fields = ['task', 'message', 'notification_type', 'is_read']
+
+    def __init__(self, *args, **kwargs):
+        # Like TaskForm: only the user's own tasks can be linked
+        self.user = kwargs.pop('user', None)
+        super().__init__(*args, **kwargs)
+        self.fields['task'].queryset = Task.objects.for_user(self.user) if self.user else Task.objects.none()
+
+class TaskImportForm(forms.Form):
+    FORMAT_CHOICES = [
+        ('', 'From file extension'),
+        ('csv', 'CSV'),
+        ('jsonl', 'JSON Lines'),
+    ]
+
+    file = forms.FileField(help_text="CSV with a header row, or JSON Lines. Columns: title, description, category, due_date, completed, priority.")
+    format = forms.ChoiceField(choices=FORMAT_CHOICES, required=False)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        for field_name, field in self.fields.items():
+            field.widget.attrs.update({'class': 'mt-1 block w-full rounded-md border-gray-300 shadow-sm focus:border-blue-500 focus:ring-blue-500 sm:text-sm'})
+
+    def clean(self):
+        cleaned_data = super().clean()
+        upload = cleaned_data.get('file')
+        if upload and not cleaned_data.get('format'):
+            extension = upload.name.rsplit('.', 1)[-1].lower()
+            if extension not in ('csv', 'jsonl'):
+                raise forms.ValidationError("Choose a format: the file extension isn't .csv or .jsonl.")
+            cleaned_data['format'] = extension
+        return cleaned_data
@@ -0,0 +1,144 @@
+# tasks/generator.py
+import random
+import time
+from dataclasses import dataclass, field
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+
+from .dashboard import DUE_SOON_WINDOW
+from .models import Task, Category, Notification
+
+VERBS = ('Write', 'Review', 'Fix', 'Plan', 'Call', 'Buy', 'Book', 'Prepare', 'Send', 'Clean', 'Update', 'Read')
+NOUNS = ('report', 'invoice', 'slides', 'groceries', 'dentist', 'budget', 'newsletter', 'garage', 'contract',
+         'roadmap', 'tickets', 'backups', 'presentation', 'taxes', 'birthday gift', 'car service')
+CATEGORY_NAMES = ('Work', 'Personal', 'Shopping', 'Health', 'Learning', 'Finance', 'Home', 'Travel',
+                  'Family', 'Projects', 'Errands', 'Hobbies')
+PRIORITY_WEIGHTS = (('low', 3), ('medium', 5), ('high', 2))
+
+
+@dataclass
+class GeneratedDataset:
+    usernames: list = field(default_factory=list)
+    categories: int = 0
+    tasks: int = 0
+    notifications: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self):
+        rows = len(self.usernames) + self.categories + self.tasks + self.notifications
+        return rows / self.seconds if self.seconds else 0.0
+
+
+def task_counts(rng, users, tasks_per_user, skew):
+    """
+    Splits users * tasks_per_user tasks over the users following a Pareto
+    distribution (shape `skew`; lower is more skewed), so a few heavy users
+    own most of the tasks like in production. Every user gets at least one.
+    """
+    total = users * tasks_per_user
+    weights = [rng.paretovariate(skew) for _ in range(users)]
+    scale = (total - users) / sum(weights)
+    counts = [1 + int(weight * scale) for weight in weights]
+    # Hand the rounding remainder to the heaviest users
+    for index in sorted(range(users), key=lambda i: -weights[i])[:total - sum(counts)]:
+        counts[index] += 1
+    return counts
+
+
+def generate_dataset(users=10, tasks_per_user=100, skew=1.16, categories_per_user=5, due_spread_days=60,
+                     completion_ratio=0.4, notification_ratio=0.3, seed=0, prefix='loaduser',
+                     password='password', batch_size=5000, now=None):
+    """
+    Bulk-inserts a synthetic dataset and returns a GeneratedDataset. The same
+    seed (and `now`) produces the same rows. Due dates spread over
+    +/- `due_spread_days` around now; roughly `notification_ratio` of the
+    pending overdue / due-soon tasks get a reminder notification, as
+    send_reminders would have created. Rows go in with bulk_create, so no
+    signals run: no change log entries and no per-task reminder handling.
+    Needs a backend that returns primary keys from bulk_create (SQLite 3.35+,
+    PostgreSQL).
+    """
+    rng = random.Random(seed)
+    now = now or timezone.now()
+    started = time.monotonic()
+    result = GeneratedDataset()
+    User = get_user_model()
+
+    # One hash for everybody: make_password is deliberately slow
+    hashed = make_password(password)
+    with transaction.atomic():
+        created = User.objects.bulk_create([
+            User(username=f'{prefix}{index:06d}', email=f'{prefix}{index:06d}@example.com', password=hashed)
+            for index in range(users)
+        ], batch_size=batch_size)
+    result.usernames = [user.username for user in created]
+    user_ids = [user.pk for user in created]
+
+    with transaction.atomic():
+        Category.objects.bulk_create([
+            Category(user_id=user_id, name=name, description=f'{name} tasks')
+            for user_id in user_ids
+            for name in CATEGORY_NAMES[:categories_per_user]
+        ], batch_size=batch_size)
+    categories = {}
+    for user_id, pk in Category.objects.filter(user_id__in=user_ids).order_by('pk').values_list('user_id', 'pk'):
+        categories.setdefault(user_id, []).append(pk)
+    result.categories = sum(len(pks) for pks in categories.values())
+
+    priorities, weights = zip(*PRIORITY_WEIGHTS)
+    spread = timezone.timedelta(days=due_spread_days).total_seconds()
+    pending = []
+    for user_id, count in zip(user_ids, task_counts(rng, users, tasks_per_user, skew)):
+        user_categories = categories.get(user_id, [])
+        for _ in range(count):
+            due_date = None if rng.random() < 0.1 else now + timezone.timedelta(seconds=rng.uniform(-spread, spread))
+            completed = rng.random() < completion_ratio
+            reminded = (
+                not completed and due_date is not None and due_date <= now + DUE_SOON_WINDOW
+                and rng.random() < notification_ratio
+            )
+            pending.append(Task(
+                user_id=user_id,
+                title=f'{rng.choice(VERBS)} {rng.choice(NOUNS)}',
+                description=f'Generated task #{rng.randrange(10 ** 6)}' if rng.random() < 0.5 else None,
+                category_id=rng.choice(user_categories) if user_categories and rng.random() < 0.8 else None,
+                due_date=due_date,
+                completed=completed,
+                priority=rng.choices(priorities, weights)[0],
+                has_active_reminder_notification=reminded,
+            ))
+            if len(pending) >= batch_size:
+                flush_tasks(pending, rng, now, result)
+                pending = []
+    flush_tasks(pending, rng, now, result)
+
+    result.seconds = time.monotonic() - started
+    return result
+
+
+def flush_tasks(tasks, rng, now, result):
+    """
+    Inserts one batch of generated tasks, then the reminder notifications
+    for the flagged ones, in one transaction.
+    """
+    if not tasks:
+        return
+    with transaction.atomic():
+        tasks = Task.objects.bulk_create(tasks)
+        notifications = [
+            Notification(
+                user_id=task.user_id,
+                task_id=task.pk,
+                message=f"Task '{task.title}' {'is overdue!' if task.due_date <= now else 'is due soon!'}",
+                notification_type='overdue' if task.due_date <= now else 'due_soon',
+                is_read=rng.random() < 0.5,
+            )
+            for task in tasks if task.has_active_reminder_notification
+        ]
+        Notification.objects.bulk_create(notifications)
+    result.tasks += len(tasks)
+    result.notifications += len(notifications)
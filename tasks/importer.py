@@ -0,0 +1,190 @@
+# tasks/importer.py
+import csv
+import json
+import time
+from dataclasses import dataclass, field
+from itertools import islice
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .changelog import record_changes
+from .dashboard import invalidate_dashboard_snapshot
+from .models import Task, Category
+
+IMPORT_FORMATS = ('csv', 'jsonl')
+TRUE_VALUES = {'1', 'true', 'yes', 'y', 'on'}
+FALSE_VALUES = {'', '0', 'false', 'no', 'n', 'off'}
+PRIORITIES = {value for value, _ in Task.PRIORITY_CHOICES}
+TITLE_MAX_LENGTH = Task._meta.get_field('title').max_length
+CATEGORY_MAX_LENGTH = Category._meta.get_field('name').max_length
+
+
+class RowError(ValueError):
+    pass
+
+
+@dataclass
+class ImportResult:
+    rows: int = 0
+    created: int = 0
+    categories_created: int = 0
+    # (line number, reason) for every row that was skipped
+    rejected: list = field(default_factory=list)
+    # Why the file stopped being readable part way; the batches before it stay imported
+    error: str = ''
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def read_records(stream, import_format):
+    """
+    Yields (line number, dict) from a text stream, one record at a time, so
+    the file is never loaded whole. CSV needs a header row; JSON Lines has
+    one object per line. A malformed JSON line yields a RowError instead.
+    """
+    if import_format == 'csv':
+        reader = csv.DictReader(stream)
+        for record in reader:
+            yield reader.line_num, record
+        return
+    for number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield number, RowError('Invalid JSON.')
+            continue
+        yield number, record if isinstance(record, dict) else RowError('Expected a JSON object.')
+
+
+def parse_bool(value):
+    if isinstance(value, bool):
+        return value
+    text = str(value if value is not None else '').strip().lower()
+    if text in TRUE_VALUES:
+        return True
+    if text in FALSE_VALUES:
+        return False
+    raise RowError(f"Invalid boolean: {value!r}")
+
+
+def parse_record(record):
+    """
+    Validates one record. Returns (task fields, category name or None);
+    raises RowError with the reason otherwise. Unknown keys (such as the
+    id / created_at / updated_at columns of an export) are ignored.
+    """
+    if isinstance(record, RowError):
+        raise record
+    title = str(record.get('title') or '').strip()
+    if not title:
+        raise RowError('Missing title.')
+    if len(title) > TITLE_MAX_LENGTH:
+        raise RowError(f'Title longer than {TITLE_MAX_LENGTH} characters.')
+
+    due_date = record.get('due_date') or None
+    if due_date is not None:
+        try:
+            # None for the wrong format; ValueError for impossible values such as month 13
+            parsed = parse_datetime(str(due_date).strip())
+            if parsed is not None and timezone.is_naive(parsed):
+                parsed = timezone.make_aware(parsed)
+        except ValueError:
+            parsed = None
+        if parsed is None:
+            raise RowError(f"Invalid due_date: {due_date!r}")
+        due_date = parsed
+
+    priority = str(record.get('priority') or 'medium').strip().lower()
+    if priority not in PRIORITIES:
+        raise RowError(f"Invalid priority: {priority!r}")
+
+    category = str(record.get('category') or '').strip() or None
+    if category and len(category) > CATEGORY_MAX_LENGTH:
+        raise RowError(f'Category name longer than {CATEGORY_MAX_LENGTH} characters.')
+
+    fields = {
+        'title': title,
+        'description': record.get('description') or None,
+        'due_date': due_date,
+        'completed': parse_bool(record.get('completed')),
+        'priority': priority,
+    }
+    return fields, category
+
+
+def resolve_categories(user, names, known):
+    """
+    Makes sure every category name exists for `user` and fills `known`
+    (name -> pk): one INSERT that skips existing (user, name) pairs and one
+    lookup, for the names not already resolved.
+    """
+    missing = sorted(set(names) - known.keys())
+    if not missing:
+        return
+    Category.objects.bulk_create([Category(user=user, name=name) for name in missing], ignore_conflicts=True)
+    known.update(Category.objects.for_user(user).filter(name__in=missing).values_list('name', 'pk'))
+
+
+def import_tasks(user, records, batch_size=1000):
+    """
+    Imports (line number, record) pairs from read_records() for `user`.
+    Each batch is one transaction: categories resolved with one lookup,
+    tasks inserted with bulk_create (which skips the per-row post_save
+    handlers; send_reminders picks the new tasks up through updated_at)
+    and the sync change log written alongside. Returns an ImportResult.
+
+    A file that can't be decoded or parsed part way stops the import there:
+    the batches before it are committed, so the result reports them along
+    with the error instead of raising.
+    """
+    result = ImportResult()
+    started = time.monotonic()
+    # A user has few categories: resolve the existing ones up front, batches only look up new names
+    categories = dict(Category.objects.for_user(user).values_list('name', 'pk'))
+    existing = set(categories)
+    records = iter(records)
+
+    try:
+        while True:
+            try:
+                batch = list(islice(records, batch_size))
+            except (UnicodeDecodeError, csv.Error) as e:
+                result.error = f"Could not read the file after row {result.rows}: {e}"
+                break
+            if not batch:
+                break
+            result.rows += len(batch)
+            parsed = []
+            for number, record in batch:
+                try:
+                    parsed.append(parse_record(record))
+                except RowError as e:
+                    result.rejected.append((number, str(e)))
+            if not parsed:
+                continue
+
+            with transaction.atomic():
+                names = {name for _, name in parsed if name}
+                resolve_categories(user, names, categories)
+                tasks = Task.objects.bulk_create([
+                    Task(user=user, category_id=categories.get(name), **fields) for fields, name in parsed
+                ])
+                new_names = names - existing
+                record_changes(user.pk, Category, [categories[name] for name in new_names])
+                record_changes(user.pk, Task, [task.pk for task in tasks])
+            result.created += len(tasks)
+            result.categories_created += len(new_names)
+            existing |= new_names
+    finally:
+        # Committed batches show on the dashboard whatever stopped the import
+        if result.created:
+            invalidate_dashboard_snapshot(user.pk)
+    result.seconds = time.monotonic() - started
+    return result
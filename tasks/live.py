@@ -0,0 +1,187 @@
+# tasks/live.py
+import asyncio
+import json
+import logging
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections
+from django.db.models import Count
+
+from . import changelog
+from .models import Notification
+
+# Change-log entries read per poll; a fuller batch polls again straight away
+POLL_BATCH = 500
+NOTIFICATION_FIELDS = ('id', 'user_id', 'task_id', 'message', 'notification_type', 'created_at')
+# Longest wait (seconds) between polls while the change log can't be read
+POLL_MAX_BACKOFF = 60
+
+logger = logging.getLogger(__name__)
+
+
+def sse(event, data, event_id=None):
+    """
+    Formats one Server-Sent Event.
+    """
+    lines = [f'id: {event_id}'] if event_id is not None else []
+    lines += [f'event: {event}', f'data: {json.dumps(data, cls=DjangoJSONEncoder)}']
+    return '\n'.join(lines) + '\n\n'
+
+
+def stream_snapshot(user_id):
+    """
+    What a new stream starts from: the change-log token to follow and the
+    user's unread count, from the cached counter when there is one, so
+    reconnecting browsers don't each COUNT.
+    """
+    # Imported here: notifications imports changelog, which imports this module
+    from .notifications import get_unread_count
+    return changelog.current_token(), get_unread_count(user_id)
+
+
+def collect_events(user_ids, after):
+    """
+    Reads the notification change-log entries after token `after` and returns
+    ([(user_id, sse_text)], token, more) for the users in `user_ids`: every
+    new or changed unread notification, then one unread count per user.
+    """
+    entries = list(
+        changelog.visible_entries().filter(pk__gt=after, model=Notification._meta.model_name)
+        .order_by('pk').values_list('pk', 'user_id', 'object_id', 'action')[:POLL_BATCH]
+    )
+    if not entries:
+        return [], after, False
+    token, more = entries[-1][0], len(entries) == POLL_BATCH
+
+    touched = {}
+    for _, user_id, object_id, action in entries:
+        if user_id in user_ids:
+            upserted = touched.setdefault(user_id, set())
+            if action == 'upsert':
+                upserted.add(object_id)
+    if not touched:
+        return [], token, more
+
+    events = []
+    upserted = set().union(*touched.values())
+    if upserted:
+        notifications = Notification.objects.filter(pk__in=upserted, is_read=False).order_by('pk')
+        for row in notifications.values(*NOTIFICATION_FIELDS):
+            events.append((row.pop('user_id'), sse('notification', row, token)))
+    counts = dict(
+        Notification.objects.filter(user_id__in=touched, is_read=False)
+        .values('user_id').annotate(unread=Count('pk')).values_list('user_id', 'unread')
+    )
+    events += [(user_id, sse('unread', {'unread': counts.get(user_id, 0)}, token)) for user_id in touched]
+    return events, token, more
+
+
+class LiveNotifications:
+    """
+    In-process pub/sub behind the notification stream. Each connected browser
+    is an asyncio.Queue on the worker's event loop, so idle connections cost
+    no thread. A single poller task per process follows the change log (one
+    query per LIVE_POLL_SECONDS while anyone is connected) and fans events
+    out to the subscribed users; record_changes() wakes it on commit, so
+    notifications written by this process go out immediately and those from
+    other processes (send_reminders, other workers) within the poll interval.
+    """
+
+    def __init__(self):
+        self.loop = None
+        self.subscribers = {}
+        self.poller = None
+        self.wakeup = None
+        self.token = 0
+
+    def subscribe(self, user_id, token):
+        """
+        Registers a queue for `user_id` on the running loop; events after
+        change-log `token` are delivered to it.
+        """
+        loop = asyncio.get_running_loop()
+        if loop is not self.loop:
+            # A new event loop (first connection, or a test run) starts from scratch
+            self.loop, self.subscribers, self.poller, self.wakeup = loop, {}, None, asyncio.Event()
+        queue = asyncio.Queue(settings.LIVE_QUEUE_SIZE)
+        self.subscribers.setdefault(user_id, set()).add(queue)
+        if self.poller is None or self.poller.done():
+            self.token = token
+            self.poller = loop.create_task(self.poll())
+        return queue
+
+    def unsubscribe(self, user_id, queue):
+        queues = self.subscribers.get(user_id, set())
+        queues.discard(queue)
+        if not queues:
+            self.subscribers.pop(user_id, None)
+        if not self.subscribers and self.poller is not None:
+            self.poller.cancel()
+            self.poller = None
+
+    def publish(self, user_id, event):
+        for queue in self.subscribers.get(user_id, ()):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # A stalled client misses events; the next unread count puts its badge right
+                pass
+
+    def wake(self):
+        """
+        Makes the poller look at the change log now. Safe to call from any
+        thread; does nothing while no stream is connected.
+        """
+        loop, wakeup = self.loop, self.wakeup
+        if self.poller is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(wakeup.set)
+
+    async def poll(self):
+        failures = 0
+        while True:
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), settings.LIVE_POLL_SECONDS)
+            except TimeoutError:
+                pass
+            self.wakeup.clear()
+            try:
+                events, self.token, more = await sync_to_async(collect_events)(set(self.subscribers), self.token)
+            except Exception:
+                # A locked database or dropped connection must not end the poller: the token stays
+                # put, so nothing is lost, and the next attempt backs off
+                failures += 1
+                logger.exception("Live notification poll failed (%d in a row)", failures)
+                await sync_to_async(close_old_connections)()
+                await asyncio.sleep(min(settings.LIVE_POLL_SECONDS * 2 ** (failures - 1), POLL_MAX_BACKOFF))
+                self.wakeup.set()
+                continue
+            failures = 0
+            for user_id, event in events:
+                self.publish(user_id, event)
+            if more:
+                self.wakeup.set()
+
+
+live_notifications = LiveNotifications()
+
+
+async def notification_stream(user_id, token, unread):
+    """
+    Server-Sent Events for one connection: the current unread count, then
+    whatever the poller publishes, with keepalive comments in between. Ends
+    after LIVE_STREAM_SECONDS; EventSource reconnects by itself.
+    """
+    queue = live_notifications.subscribe(user_id, token)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.LIVE_STREAM_SECONDS
+    try:
+        yield f'retry: {settings.LIVE_RETRY_MILLISECONDS}\n' + sse('unread', {'unread': unread}, token)
+        while (remaining := deadline - loop.time()) > 0:
+            try:
+                yield await asyncio.wait_for(queue.get(), min(settings.LIVE_KEEPALIVE_SECONDS, remaining))
+            except TimeoutError:
+                yield ': keepalive\n\n'
+    finally:
+        live_notifications.unsubscribe(user_id, queue)
@@ -0,0 +1,70 @@
+# tasks/management/commands/benchmark_async_views.py
+import asyncio
+import json
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+from tasks.benchmark import THROUGHPUT_PAGES, asgi_throughput, wsgi_throughput
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares the throughput of the task list, dashboard and notification list served by the sync views "
+        "through the WSGI handler (one thread per concurrent request) with the async views through the ASGI "
+        "handler (one event loop), in-process and at high concurrency. Each mode runs in its own process."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('username', help='Whose pages to request (e.g. a generate_tasks user).')
+        parser.add_argument('--concurrency', type=int, default=50, help='Requests in flight at once.')
+        parser.add_argument('--requests', type=int, default=1000, help='Requests per mode.')
+        parser.add_argument('--mode', choices=('wsgi', 'asgi'), help='Run only this mode, in this process.')
+
+    def handle(self, *args, **options):
+        if options['mode']:
+            return self.run_mode(options)
+
+        self.stdout.write(f"{'mode':<6} {'requests':>8} {'errors':>6} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8}")
+        for mode in ('wsgi', 'asgi'):
+            # The async views are picked when the URLconf loads, hence a fresh process per mode
+            env = {**os.environ, 'TASKS_ASYNC_VIEWS': str(mode == 'asgi')}
+            command = [
+                sys.executable, str(settings.BASE_DIR / 'manage.py'), 'benchmark_async_views', options['username'],
+                '--mode', mode, '--concurrency', str(options['concurrency']), '--requests', str(options['requests']),
+            ]
+            completed = subprocess.run(command, env=env, capture_output=True, text=True)
+            if completed.returncode:
+                raise CommandError(f"{mode} run failed:\n{completed.stderr}")
+            m = json.loads(completed.stdout.splitlines()[-1])
+            self.stdout.write(
+                f"{mode:<6} {m['requests']:>8} {m['errors']:>6} {m['requests_per_second']:>8.0f} "
+                f"{m['p50']:>8.1f} {m['p95']:>8.1f}"
+            )
+
+    def run_mode(self, options):
+        User = get_user_model()
+        try:
+            user = User.objects.get(username=options['username'])
+        except User.DoesNotExist:
+            raise CommandError(f"No user named '{options['username']}'.")
+
+        # The test clients send Host: testserver, as the test runner allows
+        settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, 'testserver']
+        paths = [reverse(name) for name in THROUGHPUT_PAGES]
+        if options['mode'] == 'wsgi':
+            result = wsgi_throughput(user, paths, options['concurrency'], options['requests'])
+        else:
+            result = asyncio.run(asgi_throughput(user, paths, options['concurrency'], options['requests']))
+        self.stdout.write(json.dumps({
+            'requests': result.requests,
+            'errors': result.errors,
+            'requests_per_second': result.requests_per_second,
+            'p50': result.p50,
+            'p95': result.p95,
+        }))
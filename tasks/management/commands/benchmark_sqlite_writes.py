@@ -0,0 +1,25 @@
+# tasks/management/commands/benchmark_sqlite_writes.py
+from django.core.management.base import BaseCommand
+
+from tasks.benchmark import SQLITE_WRITE_MODES, benchmark_sqlite_writes
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares SQLite write throughput and 'database is locked' failures with several writer processes, "
+        "using SQLite's defaults and the tuned settings (WAL, busy_timeout, BEGIN IMMEDIATE...). Runs against "
+        "throwaway database files, not the project database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=4, help='Concurrent writer processes.')
+        parser.add_argument('--writes', type=int, default=200, help='Write transactions per process.')
+        parser.add_argument('--directory', help='Where to create the database files (default: system temp dir).')
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'mode':<10} {'committed':>10} {'locked':>8} {'seconds':>8} {'writes/s':>10}")
+        for mode in SQLITE_WRITE_MODES:
+            m = benchmark_sqlite_writes(mode, options['processes'], options['writes'], options['directory'])
+            self.stdout.write(
+                f"{m.mode:<10} {m.committed:>10} {m.locked:>8} {m.seconds:>8.2f} {m.writes_per_second:>10.0f}"
+            )
@@ -0,0 +1,30 @@
+# tasks/management/commands/export_tasks.py
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.export import EXPORT_FORMATS, stream_export
+
+
+class Command(BaseCommand):
+    help = "Streams a user's tasks (with category names) as CSV or JSON Lines to a file or stdout."
+
+    def add_arguments(self, parser):
+        parser.add_argument('username', help='Whose tasks to export.')
+        parser.add_argument('--format', choices=sorted(EXPORT_FORMATS), default='csv', help='Output format.')
+        parser.add_argument('--output', help='File to write; defaults to stdout.')
+        parser.add_argument('--chunk-size', type=int, default=2000, help='Rows fetched from the database at a time.')
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        try:
+            user = User.objects.get(username=options['username'])
+        except User.DoesNotExist:
+            raise CommandError(f"No user named '{options['username']}'.")
+
+        chunks = stream_export(user, options['format'], chunk_size=options['chunk_size'])
+        if options['output']:
+            with open(options['output'], 'w', newline='', encoding='utf-8') as output:
+                output.writelines(chunks)
+        else:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
@@ -0,0 +1,40 @@
+# tasks/management/commands/import_tasks.py
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.importer import IMPORT_FORMATS, import_tasks, read_records
+
+
+class Command(BaseCommand):
+    help = (
+        "Imports tasks (and their categories) for a user from a CSV or JSON Lines file, streaming the file "
+        "and inserting in transactional batches. The export_tasks output can be imported as is."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('username', help='Owner of the imported tasks.')
+        parser.add_argument('path', help='CSV (with a header row) or JSON Lines file.')
+        parser.add_argument('--format', choices=IMPORT_FORMATS, help='Defaults to the file extension.')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per INSERT / transaction.')
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        try:
+            user = User.objects.get(username=options['username'])
+        except User.DoesNotExist:
+            raise CommandError(f"No user named '{options['username']}'.")
+        import_format = options['format'] or options['path'].rsplit('.', 1)[-1].lower()
+        if import_format not in IMPORT_FORMATS:
+            raise CommandError("Pass --format: the file extension isn't .csv or .jsonl.")
+
+        with open(options['path'], newline='', encoding='utf-8-sig') as stream:
+            result = import_tasks(user, read_records(stream, import_format), options['batch_size'])
+
+        for line, reason in result.rejected:
+            self.stderr.write(f"Line {line}: {reason}")
+        self.stdout.write(
+            f"Imported {result.created} of {result.rows} rows ({result.categories_created} new categories) "
+            f"in {result.seconds:.2f}s, {result.rows_per_second:.0f} rows/s; {len(result.rejected)} rejected"
+        )
+        if result.error:
+            raise CommandError(f"Import stopped early, the rows above were imported. {result.error}")
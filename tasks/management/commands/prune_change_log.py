@@ -0,0 +1,19 @@
+# tasks/management/commands/prune_change_log.py
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from tasks.changelog import prune_change_log
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes sync change-log entries older than --days. Clients whose token is older than that "
+        "are told to reset and refetch on their next sync."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=30, help='Keep entries from the last this many days.')
+
+    def handle(self, *args, **options):
+        deleted = prune_change_log(timezone.now() - timezone.timedelta(days=options['days']))
+        self.stdout.write(f"Change log: {deleted} entries pruned")
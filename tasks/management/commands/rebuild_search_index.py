@@ -0,0 +1,19 @@
+# tasks/management/commands/rebuild_search_index.py
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from tasks.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = "Recreates the task full-text search index (SQLite FTS5 / PostgreSQL GIN) and re-indexes every task."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS, help='Database alias to rebuild.')
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        if rebuild_search_index(connection):
+            self.stdout.write(f"Search index rebuilt on '{connection.alias}' ({connection.vendor}).")
+        else:
+            self.stdout.write(f"No full-text search support for {connection.vendor}; search uses icontains.")
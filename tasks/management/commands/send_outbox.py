@@ -0,0 +1,42 @@
+# tasks/management/commands/send_outbox.py
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from tasks.models import OutgoingEmail
+from tasks.outbox import drain_outbox
+
+
+class Command(BaseCommand):
+    help = (
+        "Sends queued emails from the outbox over a single SMTP connection, coalescing reminders "
+        "per recipient and retrying failures with backoff. Run it from cron, or with --loop."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100, help='Emails claimed per batch.')
+        parser.add_argument('--lease', type=int, default=300, help='Seconds a claimed batch is reserved for this worker.')
+        parser.add_argument('--loop', action='store_true', help='Keep running, draining every --interval seconds.')
+        parser.add_argument('--interval', type=int, default=10, help='Seconds between drains with --loop.')
+        parser.add_argument('--purge-sent-after-days', type=int, default=None, help='Delete sent emails older than this.')
+
+    def handle(self, *args, **options):
+        while True:
+            try:
+                sent, failed = drain_outbox(options['batch_size'], options['lease'])
+                if sent or failed or not options['loop']:
+                    self.stdout.write(f"Outbox: {sent} sent, {failed} failed")
+            except Exception as e:
+                # e.g. the SMTP server is unreachable; claimed rows are retried once their lease runs out
+                self.stderr.write(f"Error draining outbox: {e}")
+                if not options['loop']:
+                    raise
+
+            if options['purge_sent_after_days'] is not None:
+                cutoff = timezone.now() - timezone.timedelta(days=options['purge_sent_after_days'])
+                OutgoingEmail.objects.filter(status='sent', sent_at__lt=cutoff).delete()
+
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
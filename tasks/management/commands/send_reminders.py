@@ -0,0 +1,54 @@
+# tasks/management/commands/send_reminders.py
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from tasks.models import ReminderScanState
+from tasks.reminders import overdue_candidates, due_soon_candidates, create_reminders, iter_batches
+
+
+class Command(BaseCommand):
+    help = (
+        "Creates overdue / due-soon notifications (and queues emails) for tasks that crossed a deadline "
+        "since the previous run. Run it from cron, or with --loop as a long-lived worker."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Tasks handled per INSERT/UPDATE batch.')
+        parser.add_argument('--loop', action='store_true', help='Keep running, scanning every --interval seconds.')
+        parser.add_argument('--interval', type=int, default=60, help='Seconds between scans with --loop.')
+        parser.add_argument('--full', action='store_true', help='Ignore the high-water mark and scan every pending task.')
+
+    def handle(self, *args, **options):
+        while True:
+            self.scan(options['batch_size'], options['full'])
+            if not options['loop']:
+                break
+            options['full'] = False
+            time.sleep(options['interval'])
+
+    def scan(self, batch_size, full=False):
+        now = timezone.now()
+        state = ReminderScanState.objects.filter(name='deadlines').first()
+        since = None if full or state is None else state.high_water_mark
+
+        totals = {}
+        queued = 0
+        for notification_type, querysets in (
+            ('overdue', overdue_candidates(now, since)),
+            ('due_soon', due_soon_candidates(now, since)),
+        ):
+            totals[notification_type] = 0
+            # A task matching several querysets is only reminded once: the earlier
+            # batch's notification / flag excludes it from the later ones
+            for candidates in querysets:
+                for batch in iter_batches(candidates, batch_size):
+                    queued += create_reminders(batch, notification_type)
+                    totals[notification_type] += len(batch)
+
+        ReminderScanState.objects.update_or_create(name='deadlines', defaults={'high_water_mark': now})
+        self.stdout.write(
+            f"Reminders: {totals['overdue']} overdue, {totals['due_soon']} due soon, {queued} emails queued "
+            f"(window {since.isoformat() if since else 'start'} .. {now.isoformat()})"
+        )
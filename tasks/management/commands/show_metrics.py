@@ -0,0 +1,16 @@
+# tasks/management/commands/show_metrics.py
+import json
+
+from django.core.management.base import BaseCommand
+
+from tasks.metrics import get_counters
+
+
+class Command(BaseCommand):
+    help = (
+        "Prints the event counters (notifications created, emails sent / failed) as JSON, totalled across all "
+        "processes; running processes write theirs every METRICS_FLUSH_SECONDS."
+    )
+
+    def handle(self, *args, **options):
+        self.stdout.write(json.dumps(get_counters()))
@@ -0,0 +1,83 @@
+# tasks/metrics.py
+import atexit
+import logging
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.db.models import F
+
+from .models import EventCounter
+
+logger = logging.getLogger(__name__)
+
+# Event counters, stored in the database so every worker process adds to the same totals
+COUNTERS = ('notifications_created', 'emails_sent', 'emails_failed')
+
+# Increments not yet written to the database, per counter
+pending = Counter()
+lock = threading.Lock()
+last_flush = time.monotonic()
+
+
+def increment(name, amount=1):
+    """
+    Counts `amount` once the surrounding transaction commits (straight away
+    outside one). Increments collect in process memory and are written at
+    most every METRICS_FLUSH_SECONDS and at exit, so the shared counter rows
+    don't become a lock every notification and email waits on.
+    """
+    transaction.on_commit(lambda: add(name, amount))
+
+
+def add(name, amount):
+    global last_flush
+    with lock:
+        pending[name] += amount
+        due = time.monotonic() - last_flush >= settings.METRICS_FLUSH_SECONDS
+        if due:
+            last_flush = time.monotonic()
+    if due:
+        flush()
+
+
+def flush():
+    """
+    Writes the buffered increments, one UPDATE per counter; the first
+    increment of a counter also creates its row. Increments that fail to
+    write stay buffered for the next flush.
+    """
+    with lock:
+        amounts = dict(pending)
+        pending.clear()
+    for name, amount in amounts.items():
+        try:
+            counters = EventCounter.objects.filter(name=name)
+            if not counters.update(value=F('value') + amount):
+                # ignore_conflicts: another process may create the row at the same moment
+                EventCounter.objects.bulk_create([EventCounter(name=name)], ignore_conflicts=True)
+                counters.update(value=F('value') + amount)
+        except DatabaseError:
+            logger.warning("Could not write the %s counter; keeping %d for the next flush", name, amount, exc_info=True)
+            with lock:
+                pending[name] += amount
+
+
+def flush_at_exit():
+    try:
+        flush()
+    except Exception:
+        # The database may already be gone at interpreter shutdown
+        logger.warning("Dropped unwritten event counters at exit: %s", dict(pending), exc_info=True)
+
+
+atexit.register(flush_at_exit)
+
+
+def get_counters():
+    # This process's buffered increments first, so its own totals are current
+    flush()
+    values = dict(EventCounter.objects.filter(name__in=COUNTERS).values_list('name', 'value'))
+    return {name: values.get(name, 0) for name in COUNTERS}
@@ -0,0 +1,24 @@
+from django.db import migrations
+
+from tasks.search import ensure_search_index, rebuild_search_index, drop_search_index
+
+
+def create_search_index(apps, schema_editor):
+    # SQLite FTS5 table + triggers, or a PostgreSQL tsvector column + GIN index; no-op elsewhere
+    if ensure_search_index(schema_editor.connection):
+        rebuild_search_index(schema_editor.connection)
+
+
+def remove_search_index(apps, schema_editor):
+    drop_search_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0007_outgoing_email'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, remove_search_index),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.1 on 2026-10-18 04:28
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0008_task_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeLogEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(choices=[('task', 'Task'), ('category', 'Category'), ('notification', 'Notification')], max_length=20)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('action', models.CharField(choices=[('upsert', 'Created or Updated'), ('delete', 'Deleted')], max_length=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='change_log', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'Change log entries',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['user', 'id'], name='changelog_user_id_idx')],
+            },
+        ),
+    ]
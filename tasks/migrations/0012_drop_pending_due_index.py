@@ -0,0 +1,17 @@
+# Generated by Django 5.2.1 on 2026-10-18 05:37
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0011_admin_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_pending_due_idx',
+        ),
+    ]
@@ -0,0 +1,40 @@
+# tasks/mixins.py
+from django.contrib.auth.views import redirect_to_login
+
+
+class OwnerScopedMixin:
+    """
+    For detail/update/delete views over user-owned rows. The queryset is
+    limited to the requesting user's rows, so someone else's pk is a plain
+    404 with no extra ownership query, and the object is fetched once per
+    request no matter how often get_object() is called.
+    """
+    owner_field = 'user'
+    select_related = ()
+
+    def get_queryset(self):
+        queryset = super().get_queryset().filter(**{self.owner_field: self.request.user})
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        return queryset
+
+    def get_object(self, queryset=None):
+        if queryset is not None:
+            return super().get_object(queryset)
+        if not hasattr(self, '_owned_object'):
+            self._owned_object = super().get_object()
+        return self._owned_object
+
+
+class AsyncLoginRequiredMixin:
+    """
+    LoginRequiredMixin for async views. The user is loaded with auser() and
+    put on the request, so templates and context processors never have to
+    query for it from the event loop.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        request.user = await request.auser()
+        if not request.user.is_authenticated:
+            return redirect_to_login(request.get_full_path())
+        return await super().dispatch(request, *args, **kwargs)
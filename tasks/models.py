@@ -5,6 +5,40 @@ from django.utils import timezone
 
 User = get_user_model() # Get the currently active user model
 
+
+class CategoryQuerySet(models.QuerySet):
+    def for_user(self, user):
+        return self.filter(user=user)
+
+    def with_related(self):
+        # __str__ (admin lists, form choice labels) shows the owner's username
+        return self.select_related('user')
+
+
+class TaskQuerySet(models.QuerySet):
+    # Columns the task list / dashboard rows show, sort and key their fragment cache on
+    LIST_FIELDS = ('title', 'description', 'due_date', 'completed', 'created_at', 'updated_at', 'category__name')
+
+    def for_user(self, user):
+        return self.filter(user=user)
+
+    def with_related(self):
+        # Every task listing shows the category name
+        return self.select_related('category')
+
+    def for_list(self):
+        """
+        Task list and dashboard rows: the category joined and only the
+        columns the rows use. Reading any other field queries per row.
+        """
+        return self.with_related().only(*self.LIST_FIELDS)
+
+
+class NotificationQuerySet(models.QuerySet):
+    def for_user(self, user):
+        return self.filter(user=user)
+
+
 class Category(models.Model):
     # A category now belongs to a user (one-to-many relationship)
     user = models.ForeignKey(
@@ -15,6 +49,8 @@ class Category(models.Model):
     name = models.CharField(max_length=100)
     description = models.TextField(blank=True, null=True) # Added description back as it was in previous versions
 
+    objects = CategoryQuerySet.as_manager()
+
     class Meta:
         verbose_name_plural = "Categories" # Fixes the plural name in Django Admin
         # Add a unique constraint for name and user to ensure a user cannot have two categories with the same name
@@ -35,7 +71,8 @@ class Task(models.Model):
     user = models.ForeignKey(
         User, # Use the User model obtained from get_user_model()
         on_delete=models.CASCADE, # If a user is deleted, their tasks are also deleted
-        related_name='tasks' # Allows accessing tasks from a user object (e.g., user.tasks.all())
+        related_name='tasks', # Allows accessing tasks from a user object (e.g., user.tasks.all())
+        db_index=False, # Covered by the composite indexes in Meta, which all lead with user
     )
     title = models.CharField(max_length=200)
     description = models.TextField(blank=True, null=True)
@@ -58,9 +95,25 @@ class Task(models.Model):
     # This helps prevent generating multiple notifications for the same event
     has_active_reminder_notification = models.BooleanField(default=False)
 
+    objects = TaskQuerySet.as_manager()
 
     class Meta:
         ordering = ['due_date', 'priority'] # Default ordering for tasks
+        indexes = [
+            # Task list, dashboard and reminder queries: user + status + due date
+            models.Index(fields=['user', 'completed', 'due_date'], name='task_user_completed_due_idx'),
+            # Overdue / due-soon range scans only ever look at pending tasks
+            models.Index(fields=['user', 'due_date'], condition=models.Q(completed=False), name='task_user_pending_due_idx'),
+            # Category filter on the task list and per-category counts
+            models.Index(fields=['user', 'category'], name='task_user_category_idx'),
+            # Reminder scans: pending tasks whose last edit falls in the scan window
+            models.Index(fields=['updated_at'], condition=models.Q(completed=False), name='task_pending_updated_idx'),
+            # Admin changelist filters across all users, read newest first (by id) within the filter
+            models.Index(fields=['completed', 'id'], name='task_completed_id_idx'),
+            # Admin due date filter and the reminder scans' due date window; a pending-only copy would
+            # save little, as the window is short, for one more index on every task write
+            models.Index(fields=['due_date'], name='task_due_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -88,15 +141,114 @@ class Notification(models.Model):
         ('general', 'General'), # For future use if you want other notification types
     ]
 
-    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notifications')
+    # db_index=False: covered by the composite indexes in Meta, which all lead with user
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notifications', db_index=False)
     task = models.ForeignKey(Task, on_delete=models.CASCADE, null=True, blank=True, related_name='notifications')
     message = models.CharField(max_length=255)
     notification_type = models.CharField(max_length=20, choices=NOTIFICATION_TYPES, default='general')
     is_read = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = NotificationQuerySet.as_manager()
+
     class Meta:
         ordering = ['-created_at'] # Order by most recent first
+        indexes = [
+            # Unread badge count; partial where the backend supports it, so read rows cost nothing
+            models.Index(fields=['user', 'is_read'], condition=models.Q(is_read=False), name='notif_user_unread_idx'),
+            # Notification list, newest first
+            models.Index(fields=['user', '-created_at'], name='notif_user_created_idx'),
+            # Admin changelist filters across all users, read newest first (by id) within the filter
+            models.Index(fields=['is_read', 'id'], name='notif_read_id_idx'),
+            models.Index(fields=['notification_type', 'id'], name='notif_type_id_idx'),
+        ]
 
     def __str__(self):
         return f"Notification for {self.user.username}: {self.message}"
+
+
+# High-water mark for the send_reminders command
+class ReminderScanState(models.Model):
+    name = models.CharField(max_length=50, unique=True)
+    # Upper bound of the last completed scan; the next run only looks at what changed after it
+    high_water_mark = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.name}: {self.high_water_mark}"
+
+
+# Event counters behind `manage.py show_metrics`. In the database, not the (per-process
+# LocMemCache) default cache, so every worker process and management command adds to the same totals
+class EventCounter(models.Model):
+    name = models.CharField(max_length=50, unique=True)
+    value = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.name}: {self.value}"
+
+
+# Outgoing email queue, drained by the send_outbox command so requests never wait on SMTP
+class OutgoingEmail(models.Model):
+    KIND_CHOICES = [
+        ('reminder', 'Task Reminder'),
+        ('general', 'General'),
+    ]
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True, related_name='outgoing_emails')
+    to_email = models.EmailField()
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES, default='general')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    # Not sent before this time; pushed forward while a worker holds the row and after each failure
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            # The worker only ever looks for pending rows that are due
+            models.Index(fields=['next_attempt_at'], condition=models.Q(status='pending'), name='outbox_pending_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {self.to_email} ({self.status})"
+
+
+# Per-user change feed behind the sync API; the auto-increment id doubles as the sync token
+class ChangeLogEntry(models.Model):
+    MODEL_CHOICES = [
+        ('task', 'Task'),
+        ('category', 'Category'),
+        ('notification', 'Notification'),
+    ]
+    ACTION_CHOICES = [
+        ('upsert', 'Created or Updated'),
+        ('delete', 'Deleted'),
+    ]
+
+    # db_index=False: covered by the (user, id) index in Meta
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='change_log', db_index=False)
+    model = models.CharField(max_length=20, choices=MODEL_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['id']
+        verbose_name_plural = "Change log entries"
+        indexes = [
+            # "What changed for this user after token N"
+            models.Index(fields=['user', 'id'], name='changelog_user_id_idx'),
+        ]
+
+    def __str__(self):
+        return f"#{self.pk} {self.action} {self.model} {self.object_id}"
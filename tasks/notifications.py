@@ -0,0 +1,97 @@
+# tasks/notifications.py
+from django.conf import settings
+from django.core.cache import cache
+
+from .changelog import record_changes
+from .metrics import increment
+from .models import Notification
+
+
+def unread_count_cache_key(user_id):
+    return f'notifications:unread:{user_id}'
+
+
+def get_unread_count(user_id):
+    """
+    Returns the user's unread notification count, counting (via the partial
+    unread index) only when the cached counter is missing.
+    """
+    key = unread_count_cache_key(user_id)
+    count = cache.get(key)
+    if count is None:
+        count = Notification.objects.filter(user_id=user_id, is_read=False).count()
+        # add() rather than set() so we never clobber a counter bumped meanwhile
+        cache.add(key, count, settings.UNREAD_COUNT_CACHE_TIMEOUT)
+    return count
+
+
+async def aget_unread_count(user_id):
+    key = unread_count_cache_key(user_id)
+    count = await cache.aget(key)
+    if count is None:
+        count = await Notification.objects.filter(user_id=user_id, is_read=False).acount()
+        await cache.aadd(key, count, settings.UNREAD_COUNT_CACHE_TIMEOUT)
+    return count
+
+
+def notifications_created(user_id, count=1):
+    """
+    Bumps the cached counter after unread notifications were created. A
+    missing counter is left alone; the next read recounts.
+    """
+    increment('notifications_created', count)
+    try:
+        cache.incr(unread_count_cache_key(user_id), count)
+    except ValueError:
+        pass
+
+
+def invalidate_unread_count(user_id):
+    cache.delete(unread_count_cache_key(user_id))
+
+
+def decrement_unread_count(user_id, count):
+    """
+    Takes `count` unread notifications off the cached counter, dropping it
+    when it would go negative (it was stale anyway).
+    """
+    key = unread_count_cache_key(user_id)
+    try:
+        if cache.decr(key, count) < 0:
+            cache.delete(key)
+    except ValueError:
+        pass
+
+
+def mark_notifications_read(user_id, queryset):
+    """
+    Marks the unread notifications in `queryset` (all belonging to `user_id`)
+    as read with a single UPDATE, logs them for the sync API and decrements
+    the cached counter by the number of rows that actually flipped.
+    """
+    ids = list(queryset.filter(is_read=False).values_list('pk', flat=True))
+    if not ids:
+        return 0
+    updated = Notification.objects.filter(pk__in=ids, is_read=False).update(is_read=True)
+    record_changes(user_id, Notification, ids)
+    if updated:
+        decrement_unread_count(user_id, updated)
+    return updated
+
+
+def delete_notifications(user_id, queryset):
+    """
+    Deletes the notifications in `queryset` (all belonging to `user_id`) with
+    one DELETE, logs them for the sync API and takes the unread ones off the
+    cached counter. Returns the number deleted.
+    """
+    rows = list(queryset.order_by().values_list('pk', 'is_read'))
+    if not rows:
+        return 0
+    ids = [pk for pk, _ in rows]
+    deleted, _ = Notification.objects.filter(pk__in=ids).delete()
+    record_changes(user_id, Notification, ids, action='delete')
+    unread = sum(not is_read for _, is_read in rows)
+    if unread:
+        decrement_unread_count(user_id, unread)
+    return deleted
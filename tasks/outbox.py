@@ -0,0 +1,149 @@
+# tasks/outbox.py
+import logging
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .metrics import increment
+from .models import OutgoingEmail
+
+logger = logging.getLogger(__name__)
+
+
+def queue_email(to_email, subject, body, user=None, kind='general'):
+    """
+    Returns an unsaved OutgoingEmail; callers bulk_create them, ideally in the
+    same transaction as the change they are about.
+    """
+    return OutgoingEmail(user=user, to_email=to_email, subject=subject, body=body, kind=kind)
+
+
+def retry_delay(attempts):
+    """
+    Exponential backoff: base, 2 x base, 4 x base ... capped at the maximum.
+    """
+    delay = settings.EMAIL_OUTBOX_RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0)
+    return timezone.timedelta(seconds=min(delay, settings.EMAIL_OUTBOX_RETRY_MAX_SECONDS))
+
+
+def claim_batch(batch_size, lease_seconds):
+    """
+    Picks up to `batch_size` due, pending emails and leases them to this
+    worker by pushing next_attempt_at forward, so concurrent workers (and a
+    crashed one's leftovers, once the lease runs out) don't double-send.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        queryset = OutgoingEmail.objects.filter(status='pending', next_attempt_at__lte=now).order_by('next_attempt_at', 'pk')
+        if connection.features.has_select_for_update_skip_locked:
+            queryset = queryset.select_for_update(skip_locked=True)
+        emails = list(queryset[:batch_size])
+        if emails:
+            OutgoingEmail.objects.filter(pk__in=[email.pk for email in emails]).update(
+                next_attempt_at=now + timezone.timedelta(seconds=lease_seconds)
+            )
+    return emails
+
+
+def coalesce(emails):
+    """
+    Groups reminder emails per recipient into a single digest message. Returns
+    a list of (EmailMessage, [OutgoingEmail, ...]) pairs.
+    """
+    digests = defaultdict(list)
+    messages = []
+    for email in emails:
+        if email.kind == 'reminder':
+            digests[email.to_email].append(email)
+        else:
+            messages.append((EmailMessage(email.subject, email.body, settings.DEFAULT_FROM_EMAIL, [email.to_email]), [email]))
+
+    for to_email, group in digests.items():
+        if len(group) == 1:
+            subject, body = group[0].subject, group[0].body
+        else:
+            subject = f"You have {len(group)} task reminders"
+            body = "\n\n".join(f"{email.subject}\n{'-' * len(email.subject)}\n{email.body}" for email in group)
+        messages.append((EmailMessage(subject, body, settings.DEFAULT_FROM_EMAIL, [to_email]), group))
+    return messages
+
+
+def send_batch(emails, mail_connection):
+    """
+    Sends the claimed emails over an already open connection and records the
+    outcome. Messages go out one send_messages() call at a time: a backend
+    that fails partway through a list has already delivered the messages
+    before the failure, and those must not be sent again.
+    Returns (sent, failed) counts of OutgoingEmail rows.
+    """
+    messages = coalesce(emails)
+    results = {}
+    for message, group in messages:
+        try:
+            mail_connection.send_messages([message])
+            error = None
+        except Exception as e:
+            error = str(e) or e.__class__.__name__
+        results.update((email.pk, error) for email in group)
+
+    now = timezone.now()
+    sent_ids = [pk for pk, error in results.items() if error is None]
+    if sent_ids:
+        OutgoingEmail.objects.filter(pk__in=sent_ids).update(status='sent', sent_at=now, last_error='')
+
+    failed = 0
+    for email in emails:
+        error = results[email.pk]
+        if error is None:
+            continue
+        failed += 1
+        email.attempts += 1
+        email.last_error = error
+        if email.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+            email.status = 'failed'
+        else:
+            email.next_attempt_at = now + retry_delay(email.attempts)
+        email.save(update_fields=['attempts', 'last_error', 'status', 'next_attempt_at'])
+        logger.log(
+            logging.ERROR if email.status == 'failed' else logging.WARNING,
+            "Email %s to %s failed (attempt %d): %s", email.pk, email.to_email, email.attempts, error,
+            extra={'event': 'email_failed', 'email_id': email.pk, 'attempts': email.attempts,
+                   'gave_up': email.status == 'failed', 'error': error},
+        )
+
+    if failed:
+        increment('emails_failed', failed)
+    if sent_ids:
+        increment('emails_sent', len(sent_ids))
+        logger.info(
+            "Sent %d emails in %d messages", len(sent_ids), len(messages),
+            extra={'event': 'emails_sent', 'emails': len(sent_ids), 'messages': len(messages)},
+        )
+    return len(sent_ids), failed
+
+
+def drain_outbox(batch_size=100, lease_seconds=300):
+    """
+    Sends every due email in the outbox through a single reused connection.
+    Returns (sent, failed).
+    """
+    sent = failed = 0
+    mail_connection = None
+    try:
+        while True:
+            emails = claim_batch(batch_size, lease_seconds)
+            if not emails:
+                break
+            if mail_connection is None:
+                mail_connection = get_connection()
+                mail_connection.open()
+            batch_sent, batch_failed = send_batch(emails, mail_connection)
+            sent += batch_sent
+            failed += batch_failed
+    finally:
+        if mail_connection is not None:
+            mail_connection.close()
+    return sent, failed
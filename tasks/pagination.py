@@ -0,0 +1,331 @@
+# tasks/pagination.py
+import base64
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import F, Max, Q
+from django.http import Http404
+from django.utils.functional import cached_property
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+class CursorPage:
+    """
+    A single page of a CursorPaginator. Mirrors the parts of Django's Page
+    used by our templates (number, has_next, has_previous, paginator) and adds
+    the opaque next/previous cursor tokens.
+    """
+
+    def __init__(self, object_list, number, paginator, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.number = number
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """
+    Keyset (seek) paginator. Instead of OFFSET it filters on the ordering
+    values of the last row seen, so every page costs the same as the first.
+
+    `ordering` uses the usual order_by() syntax ('completed', '-created_at').
+    The primary key is appended as a tie-breaker when it is missing so the
+    ordering is total. The total count is only computed on demand and, when
+    a `count_cache_key` is given, cached for `count_timeout` seconds.
+    """
+
+    def __init__(self, queryset, per_page, ordering, count_cache_key=None, count_timeout=60):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.count_cache_key = count_cache_key
+        self.count_timeout = count_timeout
+
+        opts = queryset.model._meta
+        nulls_largest = connections[queryset.db].features.nulls_order_largest
+        self.fields = []
+        for name in ordering:
+            descending = name.startswith('-')
+            name = name.lstrip('-')
+            field = opts.pk if name == 'pk' else opts.get_field(name)
+            # Where NULLs end up for this direction, following the backend's default
+            nulls_at_end = (not descending) == nulls_largest
+            self.fields.append((field.attname, descending, field.null and nulls_at_end, field))
+        if not any(field.primary_key for *_, field in self.fields):
+            self.fields.append((opts.pk.attname, False, False, opts.pk))
+
+    # --- Count ---
+    @cached_property
+    def count(self):
+        if self.count_cache_key is None:
+            return self.queryset.count()
+        count = cache.get(self.count_cache_key)
+        if count is None:
+            count = self.queryset.count()
+            cache.set(self.count_cache_key, count, self.count_timeout)
+        return count
+
+    async def acount(self):
+        """
+        count for async views; fills the same cached property, so templates
+        can read .count / .num_pages afterwards without touching the database.
+        """
+        if 'count' not in self.__dict__:
+            count = await cache.aget(self.count_cache_key) if self.count_cache_key is not None else None
+            if count is None:
+                count = await self.queryset.acount()
+                if self.count_cache_key is not None:
+                    await cache.aset(self.count_cache_key, count, self.count_timeout)
+            self.__dict__['count'] = count
+        return self.count
+
+    @cached_property
+    def num_pages(self):
+        if self.count == 0:
+            return 1
+        return -(-self.count // self.per_page)
+
+    # --- Tokens ---
+    def encode_cursor(self, row, direction, number):
+        values = []
+        for attname, _, _, field in self.fields:
+            value = row[attname] if isinstance(row, dict) else getattr(row, attname)
+            values.append(_to_json(value))
+        payload = json.dumps({'v': values, 'd': direction, 'p': number}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, token):
+        try:
+            padded = token + '=' * (-len(token) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+            raw_values, direction, number = payload['v'], payload['d'], int(payload['p'])
+            if direction not in ('n', 'p') or len(raw_values) != len(self.fields) or number < 1:
+                raise ValueError
+            values = [None if raw is None else field.to_python(raw)
+                      for raw, (*_, field) in zip(raw_values, self.fields)]
+        except (ValueError, TypeError, KeyError, ValidationError) as exc:
+            raise InvalidCursor('Invalid cursor.') from exc
+        return values, direction, number
+
+    # --- Query building ---
+    def _seek_filter(self, values, reverse):
+        """
+        Builds (f1 > v1) OR (f1 = v1 AND f2 > v2) OR ... for the current
+        direction, taking care of NULLs which can't be compared with < or >.
+        """
+        branches = []
+        equal = Q()
+        for (attname, descending, nulls_at_end, field), value in zip(self.fields, values):
+            if reverse:
+                descending, nulls_at_end = not descending, field.null and not nulls_at_end
+            lookup = f'{attname}__lt' if descending else f'{attname}__gt'
+            if value is None:
+                after = None if nulls_at_end else Q(**{f'{attname}__isnull': False})
+                same = Q(**{f'{attname}__isnull': True})
+            else:
+                after = Q(**{lookup: value})
+                if nulls_at_end:
+                    after |= Q(**{f'{attname}__isnull': True})
+                same = Q(**{attname: value})
+            if after is not None:
+                branches.append(equal & after)
+            equal &= same
+
+        if not branches:
+            return None
+        condition = branches[0]
+        for branch in branches[1:]:
+            condition |= branch
+        return condition
+
+    def _order_by(self, reverse):
+        order = []
+        for attname, descending, _, _ in self.fields:
+            if reverse:
+                descending = not descending
+            order.append(F(attname).desc() if descending else F(attname).asc())
+        return order
+
+    def _page_queryset(self, token):
+        if token:
+            values, direction, number = self.decode_cursor(token)
+        else:
+            values, direction, number = None, 'n', 1
+        reverse = direction == 'p'
+
+        queryset = self.queryset.order_by(*self._order_by(reverse))
+        if values is not None:
+            condition = self._seek_filter(values, reverse)
+            queryset = queryset.filter(condition) if condition is not None else queryset.none()
+        return queryset[:self.per_page + 1], values, number, reverse
+
+    def _make_page(self, rows, values, number, reverse):
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if reverse:
+            rows.reverse()
+            if not has_more:
+                # Walked back to the start, whatever the token claimed
+                number = 1
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, values is not None
+
+        next_cursor = previous_cursor = None
+        if rows and has_next:
+            next_cursor = self.encode_cursor(rows[-1], 'n', number + 1)
+        if rows and has_previous:
+            previous_cursor = self.encode_cursor(rows[0], 'p', max(number - 1, 1))
+        return CursorPage(rows, number, self, next_cursor, previous_cursor)
+
+    def page(self, token=None):
+        queryset, values, number, reverse = self._page_queryset(token)
+        return self._make_page(list(queryset), values, number, reverse)
+
+    async def apage(self, token=None):
+        queryset, values, number, reverse = self._page_queryset(token)
+        return self._make_page([row async for row in queryset], values, number, reverse)
+
+
+def _to_json(value):
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+class CursorPaginationMixin:
+    """
+    Drop-in replacement for ListView's OFFSET pagination. Views set
+    `cursor_ordering` to the same fields they order by; the page's
+    next/previous tokens are passed back in the `cursor` query parameter.
+    """
+    cursor_ordering = None
+    cursor_query_param = 'cursor'
+
+    def get_cursor_count_cache_key(self):
+        """
+        Caches the total count per user and filter combination. Subclasses can
+        return None to always count exactly.
+        """
+        params = sorted(
+            (key, value) for key, value in self.request.GET.lists()
+            if key != self.cursor_query_param
+        )
+        digest = hashlib.md5(json.dumps(params).encode(), usedforsecurity=False).hexdigest()
+        return f'{self.__class__.__name__}:count:{self.request.user.pk}:{digest}'
+
+    def get_cursor_paginator(self, queryset, page_size):
+        return CursorPaginator(
+            queryset,
+            page_size,
+            self.cursor_ordering,
+            count_cache_key=self.get_cursor_count_cache_key(),
+            count_timeout=settings.TASKS_PAGINATION_COUNT_TIMEOUT,
+        )
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator = self.get_cursor_paginator(queryset, page_size)
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_query_param))
+        except InvalidCursor:
+            raise Http404('Invalid page.')
+        return (paginator, page, page.object_list, page.has_other_pages())
+
+    async def apaginate_queryset(self, queryset, page_size):
+        """
+        paginate_queryset() for async views. The total count is fetched up
+        front, since templates can't run queries from an async view.
+        """
+        paginator = self.get_cursor_paginator(queryset, page_size)
+        try:
+            page = await paginator.apage(self.request.GET.get(self.cursor_query_param))
+        except InvalidCursor:
+            raise Http404('Invalid page.')
+        await paginator.acount()
+        return (paginator, page, page.object_list, page.has_other_pages())
+
+    async def apage_context(self, queryset, page_size):
+        """
+        The pagination part of ListView.get_context_data(), for async views
+        rendering the same templates.
+        """
+        paginator, page, object_list, is_paginated = await self.apaginate_queryset(queryset, page_size)
+        context = {
+            'view': self,
+            'paginator': paginator,
+            'page_obj': page,
+            'is_paginated': is_paginated,
+            'object_list': object_list,
+        }
+        context_object_name = getattr(self, 'context_object_name', None)
+        if context_object_name:
+            context[context_object_name] = object_list
+        return context
+
+
+def estimated_row_count(queryset):
+    """
+    Cheap guess at the size of the queryset's whole table: the planner's
+    statistics on PostgreSQL, elsewhere the highest primary key (an index
+    lookup, and close for tables rows are rarely deleted from). None when
+    there is nothing to go on.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        # -1 until the table has been analyzed
+        return row[0] if row and row[0] >= 0 else None
+    return queryset.model._default_manager.using(queryset.db).aggregate(highest=Max('pk'))['highest']
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Admin changelist paginator for big tables. Counts exactly up to
+    TASKS_ADMIN_EXACT_COUNT_LIMIT rows past the end of `page_number`, with a
+    COUNT over a LIMITed subquery so it stops reading there. Beyond that an
+    unfiltered list reports estimated_row_count(); a filtered one reports
+    rows up to the end of that window, so its page links always reach
+    further than the page being viewed. The rows of every page are exact.
+    """
+
+    def __init__(self, object_list, per_page, orphans=0, allow_empty_first_page=True, page_number=1):
+        super().__init__(object_list, per_page, orphans, allow_empty_first_page)
+        self.page_number = page_number
+
+    @cached_property
+    def count(self):
+        limit = self.page_number * self.per_page + settings.TASKS_ADMIN_EXACT_COUNT_LIMIT
+        counted = self.object_list.order_by()[:limit + 1].count()
+        if counted <= limit:
+            return counted
+        if self.object_list.query.where:
+            return limit
+        return max(estimated_row_count(self.object_list) or 0, counted)
@@ -0,0 +1,148 @@
+# tasks/reminders.py
+import logging
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from .changelog import record_changes
+from .dashboard import DUE_SOON_WINDOW
+from .models import Task, Notification, OutgoingEmail
+from .notifications import notifications_created
+from .outbox import queue_email
+
+logger = logging.getLogger(__name__)
+
+
+def overdue_candidates(now, since=None):
+    """
+    Querysets of pending tasks that are overdue and haven't had an overdue
+    reminder for their current due date. With `since`, only tasks that
+    crossed their due date after `since`, plus tasks edited after it; each
+    is a closed range on one of the partial pending-task indexes.
+    """
+    already_reminded = Notification.objects.filter(
+        task=OuterRef('pk'),
+        notification_type='overdue',
+        created_at__gte=OuterRef('due_date'),
+    )
+    queryset = Task.objects.filter(completed=False, due_date__lte=now).filter(~Exists(already_reminded))
+    if since is None:
+        return [queryset]
+    return [
+        queryset.filter(due_date__gt=since),
+        queryset.filter(updated_at__gt=since, updated_at__lte=now),
+    ]
+
+
+def due_soon_candidates(now, since=None):
+    """
+    Querysets of pending, not yet reminded tasks due within the next seven
+    days. With `since`, only tasks that entered the window after `since`,
+    plus tasks edited after it.
+    """
+    queryset = Task.objects.filter(
+        completed=False,
+        has_active_reminder_notification=False,
+        due_date__gt=now,
+        due_date__lte=now + DUE_SOON_WINDOW,
+    )
+    if since is None:
+        return [queryset]
+    return [
+        queryset.filter(due_date__gt=since + DUE_SOON_WINDOW),
+        queryset.filter(updated_at__gt=since, updated_at__lte=now),
+    ]
+
+
+def build_reminder_email(task, notification_type):
+    """
+    Returns (subject, body) for a reminder email about `task`.
+    """
+    base_url = getattr(settings, 'BASE_URL', 'http://127.0.0.1:8000')
+    due = timezone.localtime(task.due_date).strftime('%Y-%m-%d %H:%M')
+    details = (
+        f"Description: {task.description or 'N/A'}\n"
+        f"Category: {task.category.name if task.category else 'N/A'}\n\n"
+    )
+    if notification_type == 'overdue':
+        subject = f"OVERDUE: Your Task '{task.title}'"
+        body = (
+            f"Hello {task.user.username},\n\n"
+            f"Your task '{task.title}' was due on {due}, but it is still pending.\n\n"
+            f"{details}"
+            f"Please log in to your Task Manager to update its status: {base_url}\n\n"
+            f"Thank you,\nYour Task Manager"
+        )
+    else:
+        subject = f"REMINDER: Your Task '{task.title}' is due soon!"
+        body = (
+            f"Hello {task.user.username},\n\n"
+            f"Just a friendly reminder that your task '{task.title}' is due on {due}.\n\n"
+            f"{details}"
+            f"Please log in to your Task Manager to review or complete it: {base_url}\n\n"
+            f"Thank you,\nYour Task Manager"
+        )
+    return subject, body
+
+
+def create_reminders(tasks, notification_type):
+    """
+    Creates one notification per task with a single INSERT, flips
+    has_active_reminder_notification with a single UPDATE, queues the
+    reminder emails in the outbox and logs the notifications for the sync
+    API (same transaction), then bumps the owners' unread counters. Returns
+    the number of emails queued.
+    """
+    if not tasks:
+        return 0
+    suffix = 'is overdue!' if notification_type == 'overdue' else 'is due soon!'
+    emails = []
+    for task in tasks:
+        if task.user.email:
+            subject, body = build_reminder_email(task, notification_type)
+            emails.append(queue_email(task.user.email, subject, body, user=task.user, kind='reminder'))
+
+    with transaction.atomic():
+        notifications = Notification.objects.bulk_create([
+            Notification(
+                user_id=task.user_id,
+                task=task,
+                message=f"Task '{task.title}' {suffix}",
+                notification_type=notification_type,
+            )
+            for task in tasks
+        ])
+        Task.objects.filter(pk__in=[task.pk for task in tasks]).update(has_active_reminder_notification=True)
+        OutgoingEmail.objects.bulk_create(emails)
+        by_user = defaultdict(list)
+        for notification in notifications:
+            by_user[notification.user_id].append(notification.pk)
+        for user_id, ids in by_user.items():
+            record_changes(user_id, Notification, ids)
+
+    for user_id, count in Counter(task.user_id for task in tasks).items():
+        notifications_created(user_id, count)
+    logger.info(
+        "Created %d %s reminders, queued %d emails", len(tasks), notification_type, len(emails),
+        extra={'event': 'reminders_created', 'notification_type': notification_type,
+               'notifications': len(tasks), 'emails_queued': len(emails)},
+    )
+    return len(emails)
+
+
+def iter_batches(queryset, batch_size):
+    """
+    Walks `queryset` in primary key order, `batch_size` rows at a time,
+    without OFFSET.
+    """
+    queryset = queryset.select_related('user', 'category').order_by('pk')
+    last_pk = 0
+    while True:
+        batch = list(queryset.filter(pk__gt=last_pk)[:batch_size])
+        if not batch:
+            return
+        yield batch
+        last_pk = batch[-1].pk
@@ -0,0 +1,153 @@
+# tasks/search.py
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = 'tasks_task_fts'
+PG_COLUMN = 'search_vector'
+PG_INDEX = 'tasks_task_search_gin'
+
+# SQLite: an external-content FTS5 table over tasks_task, kept in sync by triggers so
+# every write path (save, delete, QuerySet.update, bulk_create) is covered
+SQLITE_SCHEMA = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, description, content='tasks_task', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON tasks_task BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON tasks_task BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF title, description ON tasks_task BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END""",
+]
+SQLITE_DROP = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+# PostgreSQL: a generated tsvector column (title weighted above description) with a GIN index
+POSTGRES_SCHEMA = [
+    f"""ALTER TABLE tasks_task ADD COLUMN IF NOT EXISTS {PG_COLUMN} tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+    ) STORED""",
+    f"CREATE INDEX IF NOT EXISTS {PG_INDEX} ON tasks_task USING gin ({PG_COLUMN})",
+]
+POSTGRES_DROP = [
+    f"DROP INDEX IF EXISTS {PG_INDEX}",
+    f"ALTER TABLE tasks_task DROP COLUMN IF EXISTS {PG_COLUMN}",
+]
+
+_available = {}
+
+
+def ensure_search_index(connection):
+    """
+    Creates the search table/column, index and triggers when missing. Safe to
+    run repeatedly; on SQLite it also restores the triggers that a table
+    rebuild by a later migration would have dropped.
+    """
+    statements = {'sqlite': SQLITE_SCHEMA, 'postgresql': POSTGRES_SCHEMA}.get(connection.vendor)
+    if statements is None:
+        return False
+    with connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+    _available.pop(connection.alias, None)
+    return True
+
+
+def drop_search_index(connection):
+    statements = {'sqlite': SQLITE_DROP, 'postgresql': POSTGRES_DROP}.get(connection.vendor, [])
+    with connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+    _available.pop(connection.alias, None)
+
+
+def rebuild_search_index(connection):
+    """
+    Re-indexes every task from tasks_task. Returns False when the backend has
+    no search index.
+    """
+    if not ensure_search_index(connection):
+        return False
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+        else:
+            cursor.execute(f"REINDEX INDEX {PG_INDEX}")
+    return True
+
+
+def search_available(connection):
+    """
+    True when the full-text index exists on this connection. The answer is
+    cached per database alias.
+    """
+    if connection.alias not in _available:
+        available = False
+        if connection.vendor == 'sqlite':
+            available = FTS_TABLE in connection.introspection.table_names()
+        elif connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT 1 FROM information_schema.columns WHERE table_name = 'tasks_task' AND column_name = %s",
+                    [PG_COLUMN],
+                )
+                available = cursor.fetchone() is not None
+        _available[connection.alias] = available
+    return _available[connection.alias]
+
+
+def search_terms(text):
+    return re.findall(r'\w+', text)
+
+
+def search_tasks(queryset, text, ranked=False):
+    """
+    Filters a Task queryset to tasks whose title or description contain words
+    starting with each of the words in `text`, using the full-text index.
+    With `ranked=True` the result is annotated with `search_rank` (higher is
+    better) and ordered by it. Falls back to the old icontains scan when the
+    index isn't available.
+    """
+    connection = connections[queryset.db]
+    terms = search_terms(text)
+    if not terms or not search_available(connection):
+        return queryset.filter(Q(title__icontains=text) | Q(description__icontains=text))
+
+    table = queryset.model._meta.db_table
+    if connection.vendor == 'sqlite':
+        match = ' '.join(f'"{term}"*' for term in terms)
+        queryset = queryset.filter(
+            pk__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match])
+        )
+        if ranked:
+            # bm25() is lower-is-better; title matches weigh ten times description matches
+            rank = RawSQL(
+                f"SELECT -bm25({FTS_TABLE}, 10.0, 1.0) FROM {FTS_TABLE} "
+                f"WHERE {FTS_TABLE} MATCH %s AND rowid = \"{table}\".\"id\"",
+                [match], output_field=FloatField(),
+            )
+    else:
+        tsquery = ' & '.join(f'{term}:*' for term in terms)
+        queryset = queryset.alias(search_match=RawSQL(
+            f"\"{table}\".\"{PG_COLUMN}\" @@ to_tsquery('simple', %s)", [tsquery], output_field=BooleanField(),
+        )).filter(search_match=True)
+        if ranked:
+            rank = RawSQL(
+                f"ts_rank(\"{table}\".\"{PG_COLUMN}\", to_tsquery('simple', %s))", [tsquery], output_field=FloatField(),
+            )
+
+    if ranked:
+        queryset = queryset.annotate(search_rank=rank).order_by('-search_rank', 'pk')
+    return queryset
@@ -1,100 +1,81 @@
 # tasks/signals.py
-from django.db.models.signals import post_save
+import logging
+
+from django.db import connections
+from django.db.models.signals import post_save, post_migrate
 from django.dispatch import receiver
-from django.utils import timezone
-from django.core.mail import send_mail # Import send_mail
-from django.template.loader import render_to_string # To render email templates
-from django.conf import settings # To access EMAIL_HOST_USER
 
-from .models import Task, Notification
+from .changelog import record_changes
+from .dashboard import invalidate_dashboard_snapshot
+from .models import Task, Category, Notification
+from .notifications import notifications_created, invalidate_unread_count, mark_notifications_read
+from .search import ensure_search_index, search_available
+
+logger = logging.getLogger(__name__)
 
 @receiver(post_save, sender=Task)
-def create_deadline_notification(sender, instance, created, **kwargs):
+def reset_deadline_notification(sender, instance, created, **kwargs):
     """
-    Creates or updates notifications (in-app and email) for overdue or soon-due tasks.
-    Prevents duplicate notifications for the same event.
+    Clears the active reminder once a task is completed or its due date moves
+    out of the overdue/due-soon range, marking its in-app notifications read.
+    Detecting new overdue/due-soon tasks (and emailing about them) is done in
+    batches by the send_reminders management command.
     """
-    # Only consider tasks that are not completed
-    if not instance.completed:
-        # Check if task is overdue
-        if instance.is_overdue and not instance.has_active_reminder_notification:
-            # Create an overdue notification if one doesn't exist and task is overdue
-            Notification.objects.create(
-                user=instance.user,
-                task=instance,
-                message=f"Task '{instance.title}' is overdue!",
-                notification_type='overdue',
-                is_read=False
-            )
-            instance.has_active_reminder_notification = True
-            instance.save(update_fields=['has_active_reminder_notification']) # Save without re-triggering signal
-            print(f"Notification created: Task '{instance.title}' is overdue.")
+    if instance.has_active_reminder_notification and (
+        instance.completed or (not instance.is_overdue and not instance.is_due_soon)
+    ):
+        mark_notifications_read(instance.user_id, Notification.objects.filter(task=instance))
+        # update() rather than save(): no second round of post_save handlers
+        Task.objects.filter(pk=instance.pk).update(has_active_reminder_notification=False)
+        instance.has_active_reminder_notification = False
+        logger.info(
+            "Active reminder for task %s reset and its notifications marked read", instance.pk,
+            extra={'event': 'reminder_reset', 'task_id': instance.pk, 'user_id': instance.user_id},
+        )
 
-            # --- Send Email Notification for Overdue Task ---
-            if instance.user.email: # Ensure the user has an email address
-                subject = f"OVERDUE: Your Task '{instance.title}'"
-                # You can create a dedicated HTML template for the email later
-                message = (
-                    f"Hello {instance.user.username},\n\n"
-                    f"Your task '{instance.title}' was due on {instance.due_date.strftime('%Y-%m-%d %H:%M')}, but it is still pending.\n\n"
-                    f"Description: {instance.description or 'N/A'}\n"
-                    f"Category: {instance.category.name if instance.category else 'N/A'}\n\n"
-                    f"Please log in to your Task Manager to update its status: {settings.BASE_URL if hasattr(settings, 'BASE_URL') else 'http://127.0.0.1:8000'}\n\n"
-                    f"Thank you,\nYour Task Manager"
-                )
-                from_email = settings.DEFAULT_FROM_EMAIL
-                recipient_list = [instance.user.email]
 
-                try:
-                    send_mail(subject, message, from_email, recipient_list, fail_silently=False)
-                    print(f"Email sent for overdue task '{instance.title}' to {instance.user.email}")
-                except Exception as e:
-                    print(f"Error sending email for overdue task '{instance.title}': {e}")
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=Category)
+def invalidate_dashboard(sender, instance, **kwargs):
+    """
+    Drops the owner's cached dashboard snapshot whenever one of their tasks or
+    categories changes. Code that bypasses signals (QuerySet.update, bulk_create)
+    must call invalidate_dashboard_snapshot itself, as the delete helpers in bulk.py do.
+    """
+    invalidate_dashboard_snapshot(instance.user_id)
 
 
-        # Check if task is due soon (and not already overdue, handled by is_due_soon property)
-        elif instance.is_due_soon and not instance.has_active_reminder_notification:
-            # Create a 'due soon' notification if one doesn't exist and task is due soon
-            Notification.objects.create(
-                user=instance.user,
-                task=instance,
-                message=f"Task '{instance.title}' is due soon!",
-                notification_type='due_soon',
-                is_read=False
-            )
-            instance.has_active_reminder_notification = True
-            instance.save(update_fields=['has_active_reminder_notification']) # Save without re-triggering signal
-            print(f"Notification created: Task '{instance.title}' is due soon.")
+@receiver(post_save, sender=Notification)
+def update_unread_count(sender, instance, created, **kwargs):
+    """
+    Keeps the cached unread counter in step with Notification.objects.create().
+    Any other save may have flipped is_read, so the counter is recounted lazily.
+    """
+    if created:
+        if not instance.is_read:
+            notifications_created(instance.user_id)
+    else:
+        invalidate_unread_count(instance.user_id)
+
 
-            # --- Send Email Notification for Due Soon Task ---
-            if instance.user.email: # Ensure the user has an email address
-                subject = f"REMINDER: Your Task '{instance.title}' is due soon!"
-                message = (
-                    f"Hello {instance.user.username},\n\n"
-                    f"Just a friendly reminder that your task '{instance.title}' is due on {instance.due_date.strftime('%Y-%m-%d %H:%M')}.\n\n"
-                    f"Description: {instance.description or 'N/A'}\n"
-                    f"Category: {instance.category.name if instance.category else 'N/A'}\n\n"
-                    f"Please log in to your Task Manager to review or complete it: {settings.BASE_URL if hasattr(settings, 'BASE_URL') else 'http://127.0.0.1:8000'}\n\n"
-                    f"Thank you,\nYour Task Manager"
-                )
-                from_email = settings.DEFAULT_FROM_EMAIL
-                recipient_list = [instance.user.email]
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Notification)
+def log_change(sender, instance, **kwargs):
+    # Feeds the sync API; bulk writes call record_changes themselves
+    record_changes(instance.user_id, sender, [instance.pk])
 
-                try:
-                    send_mail(subject, message, from_email, recipient_list, fail_silently=False)
-                    print(f"Email sent for due soon task '{instance.title}' to {instance.user.email}")
-                except Exception as e:
-                    print(f"Error sending email for due soon task '{instance.title}': {e}")
 
+# No delete receivers: they would make Django load and delete every row of a cascade one by
+# one. Deletes go through delete_tasks(), delete_categories() and delete_notifications(),
+# which log them set-based; deleting a user logs nothing, as their change log goes with them.
 
-    # If a task is completed, or its due date is changed such that it's no longer overdue/due soon,
-    # reset the has_active_reminder_notification flag and mark notifications as read.
-    # Note: We don't send emails here, as the condition is resolved.
-    if instance.completed or (not instance.is_overdue and not instance.is_due_soon and instance.has_active_reminder_notification):
-        if instance.has_active_reminder_notification:
-            # Mark associated in-app notifications as read
-            Notification.objects.filter(task=instance, is_read=False).update(is_read=True)
-            instance.has_active_reminder_notification = False
-            instance.save(update_fields=['has_active_reminder_notification'])
-            print(f"Active reminder notification for task '{instance.title}' reset and in-app notifications marked read.")
 
+@receiver(post_migrate)
+def restore_search_index(sender, using, **kwargs):
+    """
+    SQLite rebuilds tables for some schema changes, which drops the triggers
+    keeping the search index in sync. Put them back after every migrate.
+    """
+    if sender.name == 'tasks' and search_available(connections[using]):
+        ensure_search_index(connections[using])
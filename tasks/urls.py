@@ -1,13 +1,33 @@
 # tasks/urls.py
+from django.conf import settings
 from django.urls import path
+from .api import (
+    TaskListApiView, TaskDetailApiView, CategoryListApiView, CategoryDetailApiView,
+    NotificationListApiView, NotificationDetailApiView, SyncApiView,
+)
 from .views import (
     HomeView,
-    TaskListView, TaskCreateView, TaskDetailView, TaskUpdateView, TaskDeleteView,
-    CategoryListView, CategoryCreateView, CategoryUpdateView, CategoryDeleteView, DashboardView, NotificationListView
+    TaskListView, TaskRowsView, TaskBulkActionView, TaskExportView, TaskImportView, TaskCreateView, TaskDetailView, TaskUpdateView, TaskDeleteView,
+    CategoryListView, CategoryCreateView, CategoryUpdateView, CategoryDeleteView, DashboardView, NotificationListView,
+    NotificationStreamView, AsyncTaskListView, AsyncTaskRowsView, AsyncDashboardView,
+    AsyncNotificationListView,
 )
+
+# Under ASGI the read-heavy pages can skip the thread-pool hop sync views take there
+if settings.TASKS_ASYNC_VIEWS:
+    task_list_view, task_rows_view = AsyncTaskListView, AsyncTaskRowsView
+    dashboard_view, notification_list_view = AsyncDashboardView, AsyncNotificationListView
+else:
+    task_list_view, task_rows_view = TaskListView, TaskRowsView
+    dashboard_view, notification_list_view = DashboardView, NotificationListView
+
 urlpatterns = [
     path('', HomeView.as_view(), name="home"),
-    path('list/', TaskListView.as_view(), name='task_list'),
+    path('list/', task_list_view.as_view(), name='task_list'),
+    path('list/rows/', task_rows_view.as_view(), name='task_rows'),
+    path('list/bulk/', TaskBulkActionView.as_view(), name='task_bulk_action'),
+    path('list/export/', TaskExportView.as_view(), name='task_export'),
+    path('list/import/', TaskImportView.as_view(), name='task_import'),
     path('create/', TaskCreateView.as_view(), name='task_create'),
     path('<int:pk>/', TaskDetailView.as_view(), name='task_detail'), 
     path('<int:pk>/update/', TaskUpdateView.as_view(), name='task_update'), 
@@ -20,9 +40,19 @@ urlpatterns = [
     path('categories/<int:pk>/delete/', CategoryDeleteView.as_view(), name='category_delete'),
     
     #Dashboard URL
-    path('dashboard/', DashboardView.as_view(), name='dashboard'),
+    path('dashboard/', dashboard_view.as_view(), name='dashboard'),
     
      #Notification URLs
-    path('notifications/', NotificationListView.as_view(), name='notification_list'),
+    path('notifications/', notification_list_view.as_view(), name='notification_list'),
+    path('notifications/stream/', NotificationStreamView.as_view(), name='notification_stream'),
+
+    # JSON API
+    path('api/tasks/', TaskListApiView.as_view(), name='api_task_list'),
+    path('api/tasks/<int:pk>/', TaskDetailApiView.as_view(), name='api_task_detail'),
+    path('api/categories/', CategoryListApiView.as_view(), name='api_category_list'),
+    path('api/categories/<int:pk>/', CategoryDetailApiView.as_view(), name='api_category_detail'),
+    path('api/notifications/', NotificationListApiView.as_view(), name='api_notification_list'),
+    path('api/notifications/<int:pk>/', NotificationDetailApiView.as_view(), name='api_notification_detail'),
+    path('api/sync/', SyncApiView.as_view(), name='api_sync'),
 
 ]
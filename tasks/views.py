@@ -1,80 +1,161 @@
 # tasks/views.py
-from django.views.generic import ListView, CreateView, DetailView, UpdateView, DeleteView, TemplateView, View
-from django.urls import reverse_lazy
-from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
-from django.shortcuts import get_object_or_404, render, redirect
-from django.db.models import Count, Q, Case, When, Value, CharField
+import asyncio
+import io
+
+from django.conf import settings
+from django.views.generic import ListView, CreateView, DetailView, UpdateView, DeleteView, TemplateView, View, FormView
+from django.urls import reverse, reverse_lazy
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.shortcuts import aget_object_or_404, get_object_or_404, render, redirect
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, HttpResponseBadRequest, HttpResponseRedirect, StreamingHttpResponse
+from django.utils.http import urlencode
+from django.db.models import Count, Q
 from django.utils import timezone
 
 from .models import Task, Category, Notification # Import Notification
-from .forms import TaskForm, CategoryForm
+from .dashboard import alist, aget_dashboard_snapshot, get_dashboard_snapshot
+from .forms import TaskForm, CategoryForm, TaskImportForm
+from .mixins import AsyncLoginRequiredMixin, OwnerScopedMixin
+from .notifications import aget_unread_count, mark_notifications_read
+from .pagination import CursorPaginationMixin
+from .bulk import BULK_ACTIONS, apply_bulk_action, delete_categories, delete_tasks
+from .filters import TASK_FILTER_PARAMS, filter_tasks
+from .export import EXPORT_FORMATS, astream_export, stream_export
+from .importer import import_tasks, read_records
+from .live import notification_stream, stream_snapshot
 
 # --- Existing Task Views ---
 class HomeView(TemplateView):
     template_name = 'home.html'
 
-class TaskListView(LoginRequiredMixin, ListView):
-    model = Task
+class TaskListMixin:
+    """
+    What the task list pages show, shared by TaskListView and
+    AsyncTaskListView so the two can't drift apart.
+    """
     template_name = 'tasks/task_list.html'
     context_object_name = 'tasks'
     paginate_by = 10
+    cursor_ordering = ['completed', 'due_date', '-created_at']
+
+    def order_tasks(self, queryset):
+        # Keep in sync with cursor_ordering; the paginator seeks on these columns.
+        # for_list() joins the category the rows show instead of one query per row
+        return queryset.for_list().order_by(*self.cursor_ordering)
+
+    def get_list_context(self, categories):
+        """
+        Everything besides the page of tasks; `categories` are the user's
+        categories for the filter form, ordered by name.
+        """
+        return {
+            'categories': categories,
+            'current_status': self.request.GET.get('status', ''),
+            'current_category': self.request.GET.get('category', ''),
+            'current_search_query': self.request.GET.get('q', ''),
+            'current_due_date_filter': self.request.GET.get('due_date_filter', ''),
+            'row_cache_timeout': settings.TASKS_ROW_CACHE_TIMEOUT,
+        }
+
+    def get_categories(self):
+        return Category.objects.for_user(self.request.user).order_by('name')
+
+class TaskListView(LoginRequiredMixin, TaskListMixin, CursorPaginationMixin, ListView):
+    model = Task
 
     def get_queryset(self):
-        queryset = Task.objects.filter(user=self.request.user)
+        return self.order_tasks(filter_tasks(self.request.user, self.request.GET))
 
-        status = self.request.GET.get('status')
-        category_id = self.request.GET.get('category')
-        search_query = self.request.GET.get('q')
-        due_date_filter = self.request.GET.get('due_date_filter')
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context.update(self.get_list_context(self.get_categories()))
+        return context
+
+class TaskRowsView(TaskListView):
+    """
+    Just the task list results (bulk actions, rows, pagination) for the
+    given filters and cursor, so a filter change can swap them in place.
+    """
+    template_name = 'tasks/task_rows.html'
 
-        if status == 'completed':
-            queryset = queryset.filter(completed=True)
-        elif status == 'pending':
-            queryset = queryset.filter(completed=False)
+class TaskBulkActionView(LoginRequiredMixin, View):
+    """
+    Applies complete / reopen / recategorize / delete to the tasks ticked on the
+    task list, or with select_all=1 to every task matching the list filters
+    posted alongside, as one UPDATE or DELETE.
+    """
+
+    def post(self, request, *args, **kwargs):
+        action = request.POST.get('action')
+        if action not in BULK_ACTIONS:
+            return HttpResponseBadRequest("Unknown action.")
 
-        if category_id:
+        queryset = filter_tasks(request.user, request.POST)
+        if request.POST.get('select_all') != '1':
             try:
-                category = Category.objects.get(pk=category_id, user=self.request.user)
-                queryset = queryset.filter(category=category)
-            except Category.DoesNotExist:
-                pass
-
-        if search_query:
-            queryset = queryset.filter(
-                Q(title__icontains=search_query) | Q(description__icontains=search_query)
-            )
-
-        if due_date_filter:
-            now = timezone.now()
-            today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-            today_end = now.replace(hour=23, minute=59, second=59, microsecond=999999)
-
-            if due_date_filter == 'overdue':
-                queryset = queryset.filter(completed=False, due_date__lt=now)
-            elif due_date_filter == 'today':
-                queryset = queryset.filter(due_date__range=(today_start, today_end))
-            elif due_date_filter == 'this_week':
-                end_of_week = today_end + timezone.timedelta(days=6)
-                queryset = queryset.filter(due_date__range=(now, end_of_week))
-            elif due_date_filter == 'later':
-                end_of_week = today_end + timezone.timedelta(days=6)
-                queryset = queryset.filter(due_date__gt=end_of_week)
-            elif due_date_filter == 'no_due_date':
-                queryset = queryset.filter(due_date__isnull=True)
-
-
-        queryset = queryset.order_by('completed', 'due_date', '-created_at')
+                task_ids = [int(pk) for pk in request.POST.getlist('task_ids')]
+            except ValueError:
+                return HttpResponseBadRequest("Invalid task selection.")
+            queryset = queryset.filter(pk__in=task_ids)
 
-        return queryset
+        category = None
+        if action == 'recategorize' and request.POST.get('target_category'):
+            try:
+                category_id = int(request.POST['target_category'])
+            except ValueError:
+                return HttpResponseBadRequest("Invalid category.")
+            category = get_object_or_404(Category.objects.for_user(request.user), pk=category_id)
+
+        apply_bulk_action(request.user, queryset, action, category=category)
+
+        # Back to the same filtered list
+        filters = {key: request.POST[key] for key in TASK_FILTER_PARAMS if request.POST.get(key)}
+        url = reverse('task_list')
+        return redirect(f"{url}?{urlencode(filters)}" if filters else url)
+
+class TaskExportView(LoginRequiredMixin, View):
+    """
+    Streams the user's tasks, narrowed by the task list filters, as CSV or
+    JSON Lines (?format=jsonl). Rows are produced while the response is
+    being sent, so memory use doesn't grow with the number of tasks.
+    """
+    chunk_size = 2000
 
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        context['categories'] = Category.objects.filter(user=self.request.user).order_by('name')
-        context['current_status'] = self.request.GET.get('status', '')
-        context['current_category'] = self.request.GET.get('category', '')
-        context['current_search_query'] = self.request.GET.get('q', '')
-        context['current_due_date_filter'] = self.request.GET.get('due_date_filter', '')
-        return context
+    def get(self, request, *args, **kwargs):
+        export_format = request.GET.get('format', 'csv')
+        if export_format not in EXPORT_FORMATS:
+            return HttpResponseBadRequest("Unknown export format.")
+        # Under ASGI a sync iterator would be read whole before sending; stream an async one instead
+        export = astream_export if isinstance(request, ASGIRequest) else stream_export
+        response = StreamingHttpResponse(
+            export(request.user, export_format, request.GET, self.chunk_size), content_type=EXPORT_FORMATS[export_format]
+        )
+        filename = f"tasks-{timezone.localdate().isoformat()}.{export_format}"
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+class TaskImportView(LoginRequiredMixin, FormView):
+    """
+    Imports an uploaded CSV / JSON Lines file of tasks, reading it as a
+    stream and inserting in batches, then shows what was imported and
+    which rows were rejected.
+    """
+    form_class = TaskImportForm
+    template_name = 'tasks/task_import.html'
+    max_rejected_shown = 50
+
+    def form_valid(self, form):
+        # utf-8-sig: spreadsheets like to prepend a BOM to CSV exports
+        stream = io.TextIOWrapper(form.cleaned_data['file'].file, encoding='utf-8-sig', newline='')
+        result = import_tasks(self.request.user, read_records(stream, form.cleaned_data['format']))
+        if result.error and not result.rows:
+            form.add_error('file', result.error)
+            return self.form_invalid(form)
+        return self.render_to_response(self.get_context_data(
+            form=self.form_class(), result=result, rejected=result.rejected[:self.max_rejected_shown],
+        ))
 
 class TaskCreateView(LoginRequiredMixin, CreateView):
     model = Task
@@ -91,40 +172,35 @@ class TaskCreateView(LoginRequiredMixin, CreateView):
         form.instance.user = self.request.user
         return super().form_valid(form)
 
-class TaskDetailView(LoginRequiredMixin, UserPassesTestMixin, DetailView):
+class TaskDetailView(LoginRequiredMixin, OwnerScopedMixin, DetailView):
     model = Task
     template_name = 'tasks/task_detail.html'
     context_object_name = 'task'
+    select_related = ('category',)
 
-    def test_func(self):
-        task = self.get_object()
-        return task.user == self.request.user
-
-class TaskUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
+class TaskUpdateView(LoginRequiredMixin, OwnerScopedMixin, UpdateView):
     model = Task
     form_class = TaskForm
     template_name = 'tasks/task_form.html'
     context_object_name = 'task'
     success_url = reverse_lazy('task_list')
+    select_related = ('category',)
 
     def get_form_kwargs(self):
         kwargs = super().get_form_kwargs()
         kwargs['user'] = self.request.user
         return kwargs
 
-    def test_func(self):
-        task = self.get_object()
-        return task.user == self.request.user
-
-class TaskDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
+class TaskDeleteView(LoginRequiredMixin, OwnerScopedMixin, DeleteView):
     model = Task
     template_name = 'tasks/task_confirm_delete.html'
     context_object_name = 'task'
     success_url = reverse_lazy('task_list')
+    select_related = ('category',)
 
-    def test_func(self):
-        task = self.get_object()
-        return task.user == self.request.user
+    def form_valid(self, form):
+        delete_tasks(self.request.user.pk, Task.objects.filter(pk=self.object.pk))
+        return HttpResponseRedirect(self.get_success_url())
 
 # --- Category Views ---
 class CategoryListView(LoginRequiredMixin, ListView):
@@ -134,7 +210,7 @@ class CategoryListView(LoginRequiredMixin, ListView):
 
     def get_queryset(self):
         current_user = self.request.user
-        user_categories_queryset = Category.objects.filter(user=current_user)
+        user_categories_queryset = Category.objects.for_user(current_user)
         annotated_categories = user_categories_queryset.annotate(
             task_count=Count('category_tasks', filter=Q(category_tasks__user=current_user))
         ).order_by('name')
@@ -150,80 +226,47 @@ class CategoryCreateView(LoginRequiredMixin, CreateView):
         form.instance.user = self.request.user
         return super().form_valid(form)
 
-class CategoryUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
+class CategoryUpdateView(LoginRequiredMixin, OwnerScopedMixin, UpdateView):
     model = Category
     form_class = CategoryForm
     template_name = 'tasks/category_form.html'
     context_object_name = 'category'
     success_url = reverse_lazy('category_list')
 
-    def test_func(self):
-        category = self.get_object()
-        return category.user == self.request.user
-
-class CategoryDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
+class CategoryDeleteView(LoginRequiredMixin, OwnerScopedMixin, DeleteView):
     model = Category
     template_name = 'tasks/category_confirm_delete.html'
     context_object_name = 'category'
     success_url = reverse_lazy('category_list')
 
-    def test_func(self):
-        category = self.get_object()
-        return category.user == self.request.user
+    def form_valid(self, form):
+        delete_categories(self.request.user.pk, Category.objects.filter(pk=self.object.pk))
+        return HttpResponseRedirect(self.get_success_url())
 
 # --- Dashboard View ---
-class DashboardView(LoginRequiredMixin, View):
+class DashboardMixin:
+    """
+    Dashboard context shared by DashboardView and AsyncDashboardView.
+    """
     template_name = 'tasks/dashboard.html'
 
-    def get(self, request, *args, **kwargs):
-        user_tasks = Task.objects.filter(user=request.user)
-        now = timezone.now()
-        one_week_from_now = now + timezone.timedelta(days=7)
-
-        total_tasks = user_tasks.count()
-        completed_tasks = user_tasks.filter(completed=True).count()
-        pending_tasks = user_tasks.filter(completed=False).count()
-
-        overdue_tasks_list = user_tasks.filter(
-            completed=False,
-            due_date__lt=now
-        ).order_by('due_date')
-
-        tasks_due_soon_list = user_tasks.filter(
-            completed=False,
-            due_date__range=(now, one_week_from_now)
-        ).exclude(pk__in=overdue_tasks_list.values_list('pk', flat=True)).order_by('due_date')
-
-        overdue_tasks_count = overdue_tasks_list.count()
-        tasks_due_soon_count = tasks_due_soon_list.count()
-
-        tasks_by_category_detailed = user_tasks.annotate(
-            category_name=Case(
-                When(category__isnull=False, then='category__name'),
-                default=Value('No Category'),
-                output_field=CharField()
-            )
-        ).values('category_name').annotate(
-            count=Count('category_name')
-        ).order_by('category_name')
-
-        context = {
-            'total_tasks': total_tasks,
-            'completed_tasks': completed_tasks,
-            'pending_tasks': pending_tasks,
-            'overdue_tasks_count': overdue_tasks_count,
-            'tasks_due_soon_count': tasks_due_soon_count,
-            'overdue_tasks_list': overdue_tasks_list,
-            'tasks_due_soon_list': tasks_due_soon_list,
-            'tasks_by_category': tasks_by_category_detailed,
-            'username': request.user.username,
+    def get_dashboard_context(self, snapshot):
+        # Counters, reminder lists and the category breakdown come from a per-user cached snapshot
+        return {
+            **snapshot,
+            'username': self.request.user.username,
+            'row_cache_timeout': settings.TASKS_ROW_CACHE_TIMEOUT,
         }
-        return render(request, self.template_name, context)
+
+class DashboardView(LoginRequiredMixin, DashboardMixin, View):
+
+    def get(self, request, *args, **kwargs):
+        return render(request, self.template_name, self.get_dashboard_context(get_dashboard_snapshot(request.user)))
 
     def post(self, request, *args, **kwargs):
         task_id = request.POST.get('task_id')
         if task_id:
-            task = get_object_or_404(Task, pk=task_id, user=request.user)
+            task = get_object_or_404(Task.objects.for_user(request.user), pk=task_id)
             if request.POST.get('action') == 'mark_complete':
                 task.completed = True
                 task.save()
@@ -232,16 +275,106 @@ class DashboardView(LoginRequiredMixin, View):
                 task.save()
         return redirect('dashboard')
 
-# NEW VIEW: NotificationListView
-class NotificationListView(LoginRequiredMixin, ListView):
-    model = Notification
+class NotificationListMixin:
+    """
+    Notification list settings shared by NotificationListView and
+    AsyncNotificationListView.
+    """
     template_name = 'tasks/notification_list.html'
     context_object_name = 'notifications'
     paginate_by = 10 # Optional: paginate notifications
+    cursor_ordering = ['-created_at']
+
+    def get_notifications(self):
+        # All notifications for the current user, ordered by most recent
+        return Notification.objects.for_user(self.request.user).order_by(*self.cursor_ordering)
+
+# NEW VIEW: NotificationListView
+class NotificationListView(LoginRequiredMixin, NotificationListMixin, CursorPaginationMixin, ListView):
+    model = Notification
 
     def get_queryset(self):
-        # Fetch all notifications for the current user, ordered by most recent
-        queryset = Notification.objects.filter(user=self.request.user).order_by('-created_at')
-        # Mark all displayed notifications as read when the page is loaded
-        queryset.update(is_read=True) # This will update them in the DB
+        queryset = self.get_notifications()
+        # Mark all displayed notifications as read when the page is loaded (also updates the unread counter)
+        mark_notifications_read(self.request.user.pk, queryset)
         return queryset
+
+
+class NotificationStreamView(View):
+    """
+    Pushes the user's new notifications and unread count to the nav badge as
+    Server-Sent Events. Async, so an open stream holds no thread; under WSGI
+    (runserver) it answers 204, which tells EventSource not to reconnect,
+    and the badge falls back to updating on page loads.
+    """
+
+    async def get(self, request):
+        user = await request.auser()
+        if not user.is_authenticated or not isinstance(request, ASGIRequest):
+            return HttpResponse(status=204)
+        token, unread = await sync_to_async(stream_snapshot)(user.pk)
+        response = StreamingHttpResponse(notification_stream(user.pk, token, unread), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        # Stop nginx from buffering the stream
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+
+# --- Async variants of the read-heavy pages, served instead under ASGI with TASKS_ASYNC_VIEWS ---
+# Same templates and context as their sync counterparts, through the mixins above. Every query is
+# awaited (independent ones gathered) before rendering, and the unread badge count is passed in,
+# since nothing may query from the event loop while the template renders.
+
+class AsyncTaskListView(AsyncLoginRequiredMixin, TaskListMixin, CursorPaginationMixin, View):
+
+    async def get(self, request, *args, **kwargs):
+        # filter_tasks may look up the category and the search index
+        queryset = self.order_tasks(await sync_to_async(filter_tasks)(request.user, request.GET))
+        page_context, categories, unread = await asyncio.gather(
+            self.apage_context(queryset, self.paginate_by),
+            alist(self.get_categories()),
+            aget_unread_count(request.user.pk),
+        )
+        return render(request, self.template_name, {
+            **page_context,
+            **self.get_list_context(categories),
+            'unread_notifications_count': unread,
+        })
+
+
+class AsyncTaskRowsView(AsyncTaskListView):
+    template_name = TaskRowsView.template_name
+
+
+class AsyncDashboardView(AsyncLoginRequiredMixin, DashboardMixin, View):
+
+    async def get(self, request, *args, **kwargs):
+        snapshot, unread = await asyncio.gather(
+            aget_dashboard_snapshot(request.user), aget_unread_count(request.user.pk),
+        )
+        return render(request, self.template_name, {
+            **self.get_dashboard_context(snapshot),
+            'unread_notifications_count': unread,
+        })
+
+    async def post(self, request, *args, **kwargs):
+        task_id = request.POST.get('task_id')
+        action = request.POST.get('action')
+        if task_id:
+            task = await aget_object_or_404(Task.objects.for_user(request.user), pk=task_id)
+            if action in ('mark_complete', 'mark_pending'):
+                task.completed = action == 'mark_complete'
+                await task.asave()
+        return redirect('dashboard')
+
+
+class AsyncNotificationListView(AsyncLoginRequiredMixin, NotificationListMixin, CursorPaginationMixin, View):
+
+    async def get(self, request, *args, **kwargs):
+        queryset = self.get_notifications()
+        # A few queries and cache updates that belong together; one hop to the sync side
+        await sync_to_async(mark_notifications_read)(request.user.pk, queryset)
+        page_context, unread = await asyncio.gather(
+            self.apage_context(queryset, self.paginate_by), aget_unread_count(request.user.pk),
+        )
+        return render(request, self.template_name, {**page_context, 'unread_notifications_count': unread})